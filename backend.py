@@ -1,10 +1,30 @@
 # backend.py
 
 import psycopg2
+import psycopg2.extensions
 import streamlit as st
 from datetime import datetime
 
+import profiling
+
 # --- DATABASE CONNECTION ---
+class ProfilingCursor(psycopg2.extensions.cursor):
+    """psycopg2 cursor that counts executed queries and fetched rows for the current rerun."""
+
+    def execute(self, query, vars=None):
+        profiling.count_query()
+        return super().execute(query, vars)
+
+    def fetchone(self):
+        row = super().fetchone()
+        profiling.count_query_rows(1 if row is not None else 0)
+        return row
+
+    def fetchall(self):
+        rows = super().fetchall()
+        profiling.count_query_rows(len(rows))
+        return rows
+
 def get_db_connection():
     """Establishes a connection to the PostgreSQL database."""
     try:
@@ -13,7 +33,8 @@ def get_db_connection():
             user=st.secrets["db_credentials"]["postgres"],
             password=st.secrets["db_credentials"]["Vani@08"],
             host=st.secrets["db_credentials"]["localhost"],
-            port=st.secrets["db_credentials"]["5432"]
+            port=st.secrets["db_credentials"]["5432"],
+            cursor_factory=ProfilingCursor if profiling.PROFILE_ENABLED else None
         )
         return conn
     except Exception as e:
@@ -65,6 +86,7 @@ def create_tables():
             conn.close()
 
 # --- CRUD Functions for Goals ---
+@profiling.profiled('db')
 def create_goal(employee_id, manager_id, description, due_date):
     """Adds a new goal to the database."""
     conn = get_db_connection()
@@ -77,6 +99,7 @@ def create_goal(employee_id, manager_id, description, due_date):
         finally:
             conn.close()
 
+@profiling.profiled('db')
 def get_goals(employee_id=None, manager_id=None):
     """Fetches goals based on employee or manager ID."""
     conn = get_db_connection()
@@ -99,6 +122,7 @@ def get_goals(employee_id=None, manager_id=None):
             conn.close()
     return []
 
+@profiling.profiled('db')
 def update_goal_status(goal_id, new_status):
     """Updates the status of a specific goal."""
     conn = get_db_connection()
@@ -111,6 +135,7 @@ def update_goal_status(goal_id, new_status):
             conn.close()
 
 # --- CRUD Functions for Tasks ---
+@profiling.profiled('db')
 def create_task(goal_id, description):
     """Adds a new task for a goal."""
     conn = get_db_connection()
@@ -123,6 +148,7 @@ def create_task(goal_id, description):
         finally:
             conn.close()
 
+@profiling.profiled('db')
 def get_tasks_for_goal(goal_id):
     """Fetches all tasks for a specific goal."""
     conn = get_db_connection()
@@ -136,6 +162,7 @@ def get_tasks_for_goal(goal_id):
             conn.close()
     return []
 
+@profiling.profiled('db')
 def update_task_status(task_id, new_status):
     """Updates the status of a specific task."""
     conn = get_db_connection()
@@ -148,6 +175,7 @@ def update_task_status(task_id, new_status):
             conn.close()
 
 # --- CRUD Functions for Feedback ---
+@profiling.profiled('db')
 def create_feedback(goal_id, manager_id, employee_id, content):
     """Adds new feedback for a goal."""
     conn = get_db_connection()
@@ -160,6 +188,7 @@ def create_feedback(goal_id, manager_id, employee_id, content):
         finally:
             conn.close()
 
+@profiling.profiled('db')
 def get_feedback_for_goal(goal_id):
     """Fetches feedback for a specific goal."""
     conn = get_db_connection()
@@ -174,6 +203,7 @@ def get_feedback_for_goal(goal_id):
     return []
 
 # --- Automated Feedback (Trigger-like Functionality) ---
+@profiling.profiled('db')
 def check_for_automated_feedback():
     """Checks for goals that are past due and provides automated feedback."""
     conn = get_db_connection()
@@ -0,0 +1,51 @@
+# benchmarks/bench_charts.py
+#
+# Compares figure payload size and build + serialization time of plain `px.line`
+# against the downsampling/WebGL `line_chart`. Browser paint time can't be measured
+# headlessly; the JSON payload Streamlit ships is the proxy for it. Run from the
+# repository root:
+#
+#     python -m benchmarks.bench_charts
+
+import time
+
+import plotly.express as px
+
+from charts import POINT_BUDGET, line_chart
+from benchmarks.synthetic import make_payroll_frame
+
+# (label, rows, series, freq)
+CASES = [
+    ("1k monthly", 1_000, 1, 'MS'),
+    ("100k daily", 100_000, 1, 'D'),
+    ("100k x 20 series", 100_000, 20, 'D'),
+    ("1M x 100 series", 1_000_000, 100, 'D'),
+]
+
+
+def build_and_serialize(func, df, color):
+    """Builds the figure and serializes it the way st.plotly_chart does; returns (seconds, bytes, fig)."""
+    start = time.perf_counter()
+    result = func(df, x='date', y='total_nonfarm', color=color)
+    fig = result[0] if isinstance(result, tuple) else result
+    payload = fig.to_json()
+    return time.perf_counter() - start, len(payload), fig
+
+
+def main():
+    # Warm up plotly's lazy imports so the first case isn't charged for them
+    build_and_serialize(px.line, make_payroll_frame(10), None)
+    print(f"point budget: {POINT_BUDGET:,}")
+    print(f"{'case':<20}{'points':>11}{'rendered':>10}{'before MB':>11}{'after MB':>10}{'before s':>10}{'after s':>9}")
+    for label, rows, n_series, freq in CASES:
+        df = make_payroll_frame(rows, n_series=n_series, freq=freq)
+        color = 'series_id' if n_series > 1 else None
+        before_time, before_bytes, _ = build_and_serialize(px.line, df, color)
+        after_time, after_bytes, fig = build_and_serialize(line_chart, df, color)
+        rendered = sum(len(trace.x) for trace in fig.data)
+        print(f"{label:<20}{len(df):>11,}{rendered:>10,}{before_bytes / 1e6:>11.2f}{after_bytes / 1e6:>10.2f}"
+              f"{before_time:>10.2f}{after_time:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
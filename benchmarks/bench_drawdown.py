@@ -0,0 +1,103 @@
+# benchmarks/bench_drawdown.py
+#
+# Compares the vectorized drawdown engine against the per-drop loop the Dicing page
+# used to run. Run from the repository root:
+#
+#     python -m benchmarks.bench_drawdown
+#     python -m benchmarks.bench_drawdown --threshold -1 --max-legacy-rows 20000
+
+import argparse
+import time
+
+import pandas as pd
+
+from drawdown import compute_drawdowns
+from benchmarks.synthetic import make_payroll_frame
+
+# (label, rows, series, freq)
+CASES = [
+    ("1k monthly", 1_000, 1, 'MS'),
+    ("3.6k monthly", 3_600, 1, 'MS'),
+    ("20k daily", 20_000, 1, 'D'),
+    ("100k daily", 100_000, 1, 'D'),
+    ("100k x 100 series", 100_000, 100, 'MS'),
+    ("1M x 1000 series", 1_000_000, 1_000, 'MS'),
+]
+
+
+def legacy_recovery_loop(df, threshold=-2.0):
+    """The original `create_dicing_charts` loop, minus the Streamlit calls."""
+    df = df.copy()
+    df['mom_growth'] = df['total_nonfarm'].pct_change() * 100
+    significant_drops = df[df['mom_growth'] < threshold].copy()
+    recovery_data = []
+    for index, row in significant_drops.iterrows():
+        drop_date = row['date']
+        pre_drop_data = df[df['date'] < drop_date]
+        if not pre_drop_data.empty:
+            prior_peak_employment = pre_drop_data['total_nonfarm'].max()
+            post_drop_data = df[df['date'] > drop_date]
+            recovery_month = post_drop_data[post_drop_data['total_nonfarm'] >= prior_peak_employment].first_valid_index()
+            if recovery_month is not None:
+                months_to_recover = (df.loc[recovery_month]['date'].year - drop_date.year) * 12 + (df.loc[recovery_month]['date'].month - drop_date.month)
+                recovery_data.append({
+                    'drop_date': drop_date,
+                    'prior_peak_date': df.loc[pre_drop_data['total_nonfarm'].idxmax()]['date'],
+                    'months_to_recover': months_to_recover
+                })
+            else:
+                recovery_data.append({'drop_date': drop_date, 'prior_peak_date': pd.NaT, 'months_to_recover': None})
+    return pd.DataFrame(recovery_data, columns=['drop_date', 'prior_peak_date', 'months_to_recover'])
+
+
+def legacy_multi_series(df, threshold=-2.0):
+    """Runs the legacy loop once per series, the only way it can handle many series."""
+    return pd.concat([legacy_recovery_loop(group, threshold) for _, group in df.groupby('series_id')],
+                     ignore_index=True)
+
+
+def check_matches(legacy, vectorized):
+    """Asserts the engine reproduces the legacy prior-peak and recovery results."""
+    expected = legacy.sort_values('drop_date', kind='mergesort').reset_index(drop=True)
+    actual = vectorized.sort_values('drop_date', kind='mergesort').reset_index(drop=True)
+    assert len(expected) == len(actual), f"{len(expected)} legacy drops vs {len(actual)} vectorized"
+    assert (expected['drop_date'].values == actual['drop_date'].values).all()
+    recovered = actual['months_to_recover'].notna().to_numpy()
+    assert (expected['months_to_recover'].notna().to_numpy() == recovered).all()
+    assert (expected['months_to_recover'][recovered].astype(int).values
+            == actual['months_to_recover'][recovered].astype(int).values).all()
+    assert (expected['prior_peak_date'][recovered].values == actual['prior_peak_date'][recovered].values).all()
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the drawdown/recovery engine.")
+    parser.add_argument("--threshold", type=float, default=-2.0, help="MoM drop threshold in percent.")
+    parser.add_argument("--max-legacy-rows", type=int, default=100_000,
+                        help="Skip the legacy loop above this many rows.")
+    args = parser.parse_args()
+
+    print(f"{'case':<20}{'rows':>10}{'drops':>8}{'legacy (s)':>12}{'engine (s)':>12}{'speed-up':>10}")
+    for label, rows, n_series, freq in CASES:
+        df = make_payroll_frame(rows, n_series=n_series, freq=freq)
+        multi = n_series > 1
+        result, engine_time = timed(compute_drawdowns, df, threshold=args.threshold,
+                                    series_col='series_id' if multi else None)
+
+        legacy_cell, speedup_cell = "skipped", "-"
+        if len(df) <= args.max_legacy_rows:
+            legacy_func = legacy_multi_series if multi else legacy_recovery_loop
+            legacy, legacy_time = timed(legacy_func, df, threshold=args.threshold)
+            check_matches(legacy, result)
+            legacy_cell = f"{legacy_time:.3f}"
+            speedup_cell = f"{legacy_time / engine_time:.1f}x"
+        print(f"{label:<20}{len(df):>10,}{len(result):>8,}{legacy_cell:>12}{engine_time:>12.3f}{speedup_cell:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_engines.py
+#
+# Checks that the postgres and duckdb dashboard engines return the same results for every
+# query the dashboard issues, and compares their latency. Loads synthetic data into a
+# scratch PostgreSQL database (DB_NAME/DB_USER/DB_PASSWORD/DB_HOST) and into a temporary
+# Parquet snapshot. Run from the repository root:
+#
+#     DB_NAME=pms_bench python -m benchmarks.bench_engines
+#     DB_NAME=pms_bench python -m benchmarks.bench_engines --rows 1000000 --series 100
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import pandas as pd
+
+import engine
+import queries
+from benchmarks.olap_suite import seed_database, seed_snapshot
+from benchmarks.synthetic import make_payroll_frame
+
+
+def dashboard_queries(series_id, min_year, max_year):
+    """(label, (sql, params)) for every query shape the dashboard issues, over a few slicer states."""
+    mid_year = (min_year + max_year) // 2
+    return [
+        ("watermark", queries.watermark_query(series_id, 0)),
+        ("series rows", queries.series_rows_query(series_id)),
+        ("series rows (incremental)", queries.series_rows_query(series_id, after_date=pd.Timestamp(mid_year, 1, 1).date())),
+        ("date bounds", queries.date_bounds_query(series_id)),
+        ("average (all years)", queries.average_employment_query(series_id, min_year, max_year)),
+        ("average (10 years)", queries.average_employment_query(series_id, mid_year, mid_year + 9)),
+        ("monthly Mar-Dec", queries.monthly_employment_query(series_id, mid_year, mid_year + 1, months=range(3, 13))),
+        ("monthly Q4 months", queries.monthly_employment_query(series_id, min_year, max_year, months=[10, 11, 12])),
+        ("quarterly growth", queries.quarterly_growth_query(series_id, min_year, max_year, [1, 2, 3, 4])),
+        ("quarterly growth Q1+Q3", queries.quarterly_growth_query(series_id, mid_year, max_year, [1, 3])),
+        ("annual growth", queries.annual_growth_query(series_id, min_year, max_year)),
+    ]
+
+
+def normalize(df):
+    """Puts both engines' results on common dtypes: datetimes for dates, floats for numbers."""
+    df = df.copy()
+    for column in df.columns:
+        if column in ('date', 'min_date', 'max_date'):
+            df[column] = pd.to_datetime(df[column])
+        elif df[column].dtype == object and column != 'series_id':
+            df[column] = pd.to_numeric(df[column])
+    return df.reset_index(drop=True)
+
+
+def timed(engine_name, sql, params, repeat):
+    """Median latency over `repeat` runs, plus the last result."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = engine.read_sql(sql, params, engine=engine_name)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check parity and latency of the dashboard engines.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--series", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    if os.environ.get("DB_NAME", "vani") == "vani":
+        parser.error("DB_NAME points at the dashboard's database; set it to a scratch database.")
+
+    df = make_payroll_frame(args.rows, n_series=args.series)
+    series_id = df['series_id'].iloc[0]
+    seed_database(df)
+    engine.SNAPSHOT_DIR = tempfile.mkdtemp(prefix='bench_engines_')
+    seed_snapshot(df, engine.SNAPSHOT_DIR)
+
+    print(f"{len(df):,} rows in {args.series} series; querying {series_id}")
+    print(f"{'query':<28}{'postgres ms':>13}{'duckdb ms':>11}{'rows':>8}  parity")
+    years = df['date'].dt.year
+    for label, (sql, params) in dashboard_queries(series_id, int(years.min()), int(years.max())):
+        postgres_time, postgres_result = timed('postgres', sql, params, args.repeat)
+        duckdb_time, duckdb_result = timed('duckdb', sql, params, args.repeat)
+        pd.testing.assert_frame_equal(normalize(postgres_result), normalize(duckdb_result),
+                                      check_dtype=False, rtol=1e-9, obj=label)
+        print(f"{label:<28}{postgres_time * 1000:>13.1f}{duckdb_time * 1000:>11.1f}{len(duckdb_result):>8,}  ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_features.py
+#
+# Measures the per-rerun CPU time and peak memory of the dashboard's data preparation,
+# before (copy + per-page calendar/growth derivation) and after (shared feature frame).
+# Run from the repository root:
+#
+#     python -m benchmarks.bench_features
+
+import time
+import tracemalloc
+
+from features import build_features
+from benchmarks.synthetic import make_payroll_frame
+
+# (label, rows, series)
+CASES = [
+    ("1k rows", 1_000, 1),
+    ("100k rows", 100_000, 100),
+    ("1M rows", 1_000_000, 1_000),
+]
+PAGES = ["Slicing", "Dicing", "Roll-up", "Drill-Down"]
+
+
+def legacy_rerun(data, page):
+    """The data preparation each page did per rerun before the shared feature frame."""
+    df = data.copy()
+    if page == "Slicing":
+        df['year'] = df['date'].dt.year
+        df['month'] = df['date'].dt.month
+        return df[df['date'].dt.year.between(2010, 2025)]['total_nonfarm'].mean()
+    if page == "Dicing":
+        df['mom_growth'] = df['total_nonfarm'].pct_change() * 100
+        df['month_year'] = df['date'].dt.strftime('%b-%Y')
+        df_all = df.copy()
+        df_all['year'] = df_all['date'].dt.year
+        df_all['month'] = df_all['date'].dt.strftime('%b')
+        df_all['month_num'] = df_all['date'].dt.month
+        df_all['pct_change_mom'] = df_all['total_nonfarm'].pct_change() * 100
+        return df_all[df_all['month_num'].isin([10, 11, 12])]
+    if page == "Roll-up":
+        df['year'] = df['date'].dt.year
+        return df[df['year'].between(2000, 2009)]['total_nonfarm'].mean()
+    df['mom_drop'] = df['total_nonfarm'].diff()
+    return df.groupby(df['date'].dt.year)['total_nonfarm'].sum()
+
+
+def shared_rerun(features, page):
+    """The same preparation reading the shared feature frame without copying it."""
+    if page == "Slicing":
+        return features[features['year'].between(2010, 2025)]['total_nonfarm'].mean()
+    if page == "Dicing":
+        drops = features[features['mom_change_pct'] < -2]
+        drops['date'].dt.strftime('%b-%Y')
+        return features[features['month'].isin([10, 11, 12])]
+    if page == "Roll-up":
+        return features[features['year'].between(2000, 2009)]['total_nonfarm'].mean()
+    return features.groupby('year')['total_nonfarm'].sum()
+
+
+def measure(func, *args):
+    """Returns (seconds, peak traced MiB) for one call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main():
+    print(f"{'case':<12}{'page':<12}{'legacy ms':>11}{'shared ms':>11}{'legacy MiB':>12}{'shared MiB':>12}")
+    for label, rows, n_series in CASES:
+        data = make_payroll_frame(rows, n_series=n_series).drop(columns='series_id')
+        features = build_features(data)
+        for page in PAGES:
+            legacy_time, legacy_peak = measure(legacy_rerun, data, page)
+            shared_time, shared_peak = measure(shared_rerun, features, page)
+            print(f"{label:<12}{page:<12}{legacy_time * 1000:>11.1f}{shared_time * 1000:>11.1f}"
+                  f"{legacy_peak:>12.1f}{shared_peak:>12.1f}")
+        raw_mib = data.memory_usage(deep=True).sum() / 2**20
+        feature_mib = features.memory_usage(deep=True).sum() / 2**20
+        print(f"{label:<12}frame size: raw {raw_mib:.1f} MiB, shared features {feature_mib:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
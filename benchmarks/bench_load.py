@@ -0,0 +1,102 @@
+# benchmarks/bench_load.py
+#
+# Compares the ETL load stage's old StringIO + copy_from load with the streamed COPY into a
+# staging table (loader.py), reporting throughput and peak Python memory for large
+# multi-series loads. Drops and recreates nonfarm_payrolls in a scratch PostgreSQL database
+# (DB_NAME/DB_USER/DB_PASSWORD/DB_HOST). Run from the repository root:
+#
+#     DB_NAME=pms_bench python -m benchmarks.bench_load
+#     DB_NAME=pms_bench python -m benchmarks.bench_load --rows 5000000 --series 1000 --chunk-rows 100000
+
+import argparse
+import os
+import statistics
+import time
+import tracemalloc
+from io import StringIO
+
+import engine
+from benchmarks.synthetic import make_payroll_frame
+from loader import LOAD_COLUMNS, load_rows
+
+
+def reset_table(conn):
+    """Recreates an empty nonfarm_payrolls with the ETL's schema."""
+    with conn.cursor() as cur:
+        cur.execute("DROP TABLE IF EXISTS nonfarm_payrolls, nonfarm_payrolls_staging;")
+        cur.execute("""
+            CREATE TABLE nonfarm_payrolls (
+                series_id TEXT NOT NULL DEFAULT 'PAYEMS',
+                date DATE NOT NULL,
+                total_nonfarm DECIMAL,
+                mom_change_abs DECIMAL,
+                mom_change_pct DECIMAL,
+                PRIMARY KEY (series_id, date)
+            );
+        """)
+    conn.commit()
+
+
+def load_stringio(conn, df, chunk_rows):
+    """The previous load: the whole frame rendered into one StringIO, then copy_from."""
+    with conn.cursor() as cur:
+        buffer = StringIO()
+        df.to_csv(buffer, index=False, header=False, sep='\t')
+        buffer.seek(0)
+        cur.copy_from(buffer, 'nonfarm_payrolls', columns=LOAD_COLUMNS, sep='\t', null='')
+    conn.commit()
+
+
+def load_streamed(conn, df, chunk_rows):
+    """The current load: streamed COPY into staging, validation and an atomic swap."""
+    load_rows(conn, df, None, 'full', chunk_rows=chunk_rows)
+    conn.commit()
+
+
+def measure(load, conn, df, chunk_rows, repeat):
+    """Median wall time over `repeat` loads, then peak traced memory of one more load."""
+    times = []
+    for _ in range(repeat):
+        reset_table(conn)
+        start = time.perf_counter()
+        load(conn, df, chunk_rows)
+        times.append(time.perf_counter() - start)
+
+    reset_table(conn)
+    tracemalloc.start()
+    load(conn, df, chunk_rows)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    with conn.cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM nonfarm_payrolls;")
+        loaded = cur.fetchone()[0]
+    if loaded != len(df):
+        raise AssertionError(f"{load.__name__} loaded {loaded} rows, expected {len(df)}")
+    return statistics.median(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure ETL load throughput and peak memory.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--series", type=int, default=1_000)
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    if os.environ.get("DB_NAME", "vani") == "vani":
+        parser.error("DB_NAME points at the dashboard's database; set it to a scratch database.")
+
+    df = make_payroll_frame(args.rows, n_series=args.series)[list(LOAD_COLUMNS)]
+    print(f"{len(df):,} rows in {args.series} series, {args.chunk_rows:,} rows per COPY chunk")
+    print(f"{'load':<28}{'seconds':>9}{'rows/s':>12}{'peak MiB':>10}")
+    conn = engine.get_connection()
+    try:
+        for label, load in [("StringIO + copy_from", load_stringio), ("streamed COPY + swap", load_streamed)]:
+            seconds, peak = measure(load, conn, df, args.chunk_rows, args.repeat)
+            print(f"{label:<28}{seconds:>9.2f}{len(df) / seconds:>12,.0f}{peak / 2**20:>10.1f}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# benchmarks/olap_suite.py
+#
+# Runs the dashboard's four OLAP analyses headlessly on synthetic payroll-like data and
+# records wall time, peak memory and figure payload size per analysis as JSON.
+#
+# The analyses run through dashboard.py's own data path. With the default postgres engine,
+# point DB_NAME/DB_USER/DB_PASSWORD/DB_HOST at a scratch database: the suite drops and
+# recreates nonfarm_payrolls and etl_loads in it. The duckdb engine needs no server; the
+# data goes to a temporary Parquet snapshot. Run from the repository root:
+#
+#     DB_NAME=pms_bench python -m benchmarks.olap_suite run --output after.json
+#     python -m benchmarks.olap_suite run --engine duckdb --output duckdb.json
+#     python -m benchmarks.olap_suite compare before.json after.json --tolerance 0.2
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import pandas as pd
+
+import engine
+from charts import clear_figure_cache
+from loader import stream_copy
+from benchmarks.synthetic import make_payroll_frame
+from benchmarks.streamlit_stub import StopScript, StreamlitStub
+
+# (label, rows, series, freq); the analyses look at the first series, the rest fill the table
+CASES = {
+    '1k': (1_000, 1, 'MS'),
+    '100k': (100_000, 1, 'D'),
+    '1M-10-series': (1_000_000, 10, 'D'),
+    '1M-1000-series': (1_000_000, 1_000, 'MS'),
+}
+ANALYSES = ['slicing', 'dicing', 'roll_up', 'drill_down']
+METRICS = ['wall_s', 'load_s', 'peak_mib', 'figure_bytes']
+
+
+def seed_database(df):
+    """Replaces the scratch database's payroll tables with `df` and records one full load per series."""
+    conn = engine.get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("DROP TABLE IF EXISTS nonfarm_payrolls, etl_loads;")
+            cur.execute("""
+                CREATE TABLE nonfarm_payrolls (
+                    series_id TEXT NOT NULL,
+                    date DATE NOT NULL,
+                    total_nonfarm DECIMAL,
+                    mom_change_abs DECIMAL,
+                    mom_change_pct DECIMAL,
+                    PRIMARY KEY (series_id, date)
+                );
+            """)
+            cur.execute("""
+                CREATE TABLE etl_loads (
+                    load_id SERIAL PRIMARY KEY,
+                    table_name TEXT NOT NULL,
+                    series_id TEXT NOT NULL,
+                    max_date DATE NOT NULL,
+                    row_count INTEGER NOT NULL,
+                    mode TEXT NOT NULL,
+                    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+            """)
+            stream_copy(cur, df, 'nonfarm_payrolls', columns=tuple(df.columns))
+            # One full load per series, as if each had been loaded by etl.py
+            cur.execute("""
+                INSERT INTO etl_loads (table_name, series_id, max_date, row_count, mode)
+                SELECT 'nonfarm_payrolls', series_id, MAX(date), COUNT(*), 'full'
+                FROM nonfarm_payrolls GROUP BY series_id ORDER BY series_id;
+            """)
+            cur.execute("ANALYZE nonfarm_payrolls;")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def seed_snapshot(df, snapshot_dir):
+    """Writes `df` as a Parquet snapshot for the in-process engine, with one full load per series."""
+    loads = df.groupby('series_id', sort=True).agg(max_date=('date', 'max'), row_count=('date', 'size')).reset_index()
+    loads = loads.assign(
+        load_id=range(1, len(loads) + 1),
+        table_name='nonfarm_payrolls',
+        max_date=loads['max_date'].dt.date,
+        mode='full',
+        loaded_at=pd.Timestamp.now(),
+    )[['load_id', 'table_name', 'series_id', 'max_date', 'row_count', 'mode', 'loaded_at']]
+    engine.write_snapshot(df, loads, len(loads), 'full', snapshot_dir=snapshot_dir)
+
+
+def seed(df, engine_name, snapshot_dir):
+    """Loads `df` into whichever store `engine_name` reads from."""
+    if engine_name == 'duckdb':
+        seed_snapshot(df, snapshot_dir)
+    else:
+        seed_database(df)
+
+
+def reset_caches(dashboard):
+    """Empties the dashboard's data, query and figure caches so every run starts cold."""
+    dashboard.get_data_cache.clear()
+    dashboard.run_query.clear()
+    clear_figure_cache()
+
+
+def run_analysis(dashboard, analysis):
+    """One cold rerun of an analysis page: load the feature frame, then build the page."""
+    stub = StreamlitStub()
+    dashboard.st = stub
+    reset_caches(dashboard)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = dashboard.load_data()
+    loaded = time.perf_counter()
+    if data is None:
+        raise RuntimeError("load_data() failed; check the database connection settings")
+    try:
+        getattr(dashboard, f"create_{analysis}_charts")(data)
+    except StopScript:
+        raise RuntimeError(f"{analysis} stopped early; check the database connection settings")
+    figure_bytes = sum(len(fig.to_json()) for fig in stub.figures)
+    finished = time.perf_counter()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'wall_s': finished - start,
+        'load_s': loaded - start,
+        'peak_mib': peak / 2**20,
+        'figure_bytes': figure_bytes,
+        'figures': len(stub.figures),
+    }
+
+
+def run_suite(case_names, repeat, engine_name):
+    import dashboard
+    import streamlit
+
+    engine.ENGINE = engine_name
+    engine.SNAPSHOT_DIR = tempfile.mkdtemp(prefix='olap_suite_')
+    results = []
+    for name in case_names:
+        rows, n_series, freq = CASES[name]
+        df = make_payroll_frame(rows, n_series=n_series, freq=freq)
+        seed(df, engine_name, engine.SNAPSHOT_DIR)
+        dashboard.SERIES_ID = df['series_id'].iloc[0]
+        for analysis in ANALYSES:
+            runs = [run_analysis(dashboard, analysis) for _ in range(repeat)]
+            result = {'case': name, 'rows': len(df), 'series': n_series, 'analysis': analysis,
+                      'figures': runs[-1]['figures']}
+            for metric in METRICS:
+                result[metric] = statistics.median(run[metric] for run in runs)
+            results.append(result)
+            print(f"{name:<16}{analysis:<12}{result['wall_s']:>9.3f} s{result['peak_mib']:>9.1f} MiB"
+                  f"{result['figure_bytes'] / 1e3:>10.1f} kB", file=sys.stderr)
+        dashboard.st = streamlit
+
+    return {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'engine': engine_name,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline_path, current_path, tolerance):
+    """Prints per-metric ratios and returns the number of regressions beyond `tolerance`."""
+    with open(baseline_path) as f:
+        baseline = {(r['case'], r['analysis']): r for r in json.load(f)['results']}
+    with open(current_path) as f:
+        current = {(r['case'], r['analysis']): r for r in json.load(f)['results']}
+
+    regressions = 0
+    print(f"{'case':<16}{'analysis':<12}" + "".join(f"{m:>14}" for m in METRICS))
+    for key in sorted(baseline.keys() & current.keys()):
+        cells = []
+        for metric in METRICS:
+            before, after = baseline[key][metric], current[key][metric]
+            ratio = after / before if before else 1.0
+            flag = "!" if ratio > 1 + tolerance else " "
+            regressions += flag == "!"
+            cells.append(f"{ratio:>12.2f}x{flag}")
+        print(f"{key[0]:<16}{key[1]:<12}" + "".join(cells))
+    for key in sorted(baseline.keys() ^ current.keys()):
+        print(f"{key[0]:<16}{key[1]:<12}  only in {'baseline' if key in baseline else 'current'}")
+    print(f"{regressions} metric(s) regressed by more than {tolerance:.0%}.")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard OLAP analyses.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="Run the suite and write results as JSON.")
+    run_parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    run_parser.add_argument('--engine', choices=engine.ENGINES, default=engine.ENGINE)
+    run_parser.add_argument('--repeat', type=int, default=3, help="Runs per analysis; the median is kept.")
+    run_parser.add_argument('--output', default='-', help="JSON output path ('-' for stdout).")
+
+    compare_parser = commands.add_parser('compare', help="Compare two result files.")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--tolerance', type=float, default=0.2,
+                                help="Allowed relative increase before a metric counts as regressed.")
+
+    args = parser.parse_args()
+    if args.command == 'compare':
+        sys.exit(1 if compare(args.baseline, args.current, args.tolerance) else 0)
+
+    if args.engine == 'postgres' and os.environ.get("DB_NAME", "vani") == "vani":
+        parser.error("DB_NAME points at the dashboard's database; set it to a scratch database.")
+    report = json.dumps(run_suite(args.cases, args.repeat, args.engine), indent=2)
+    if args.output == '-':
+        print(report)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# benchmarks/streamlit_stub.py
+
+
+class StopScript(Exception):
+    """Raised by `st.stop()` while running under the stub."""
+
+
+class StreamlitStub:
+    """Headless stand-in for the `streamlit` module used by the dashboard pages.
+
+    Widgets return their default value (or `widget_values[label]` when given), charts
+    are collected in `figures`, and every other element call is a no-op.
+    """
+
+    def __init__(self, widget_values=None):
+        self.widget_values = widget_values or {}
+        self.figures = []
+        self.sidebar = self
+
+    def _value(self, label, default):
+        return self.widget_values.get(label, default)
+
+    def slider(self, label, min_value=None, max_value=None, value=None, **kwargs):
+        return self._value(label, value if value is not None else min_value)
+
+    def selectbox(self, label, options, index=0, **kwargs):
+        return self._value(label, list(options)[index])
+
+    def radio(self, label, options, index=0, **kwargs):
+        return self._value(label, list(options)[index])
+
+    def multiselect(self, label, options, default=None, **kwargs):
+        return self._value(label, list(default or []))
+
+    def plotly_chart(self, fig, **kwargs):
+        self.figures.append(fig)
+
+    def stop(self):
+        raise StopScript()
+
+    def __getattr__(self, name):
+        # header, subheader, write, metric, dataframe, info, caption, markdown, ...
+        return lambda *args, **kwargs: None
@@ -0,0 +1,37 @@
+# benchmarks/synthetic.py
+
+import numpy as np
+import pandas as pd
+
+# pandas timestamps stop in 2262, so monthly series are capped well before that
+MAX_MONTHLY_PERIODS = 3600
+
+
+def make_payroll_frame(n_rows, n_series=1, freq='MS', start='1939-01-01', seed=0):
+    """Builds a synthetic payroll-like frame shaped like the nonfarm_payrolls table.
+
+    Each series is a slowly trending random walk with rare recession shocks, so drops,
+    drawdowns and recoveries look like the real PAYEMS data. Rows are split evenly
+    across `n_series` series named SYN0000, SYN0001, ...
+    """
+    periods = max(n_rows // n_series, 2)
+    if freq == 'MS' and periods > MAX_MONTHLY_PERIODS:
+        raise ValueError(f"{periods} monthly periods per series do not fit in a pandas date range; "
+                         "use more series or freq='D'.")
+
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=periods, freq=freq)
+    steps = rng.normal(0.0015, 0.004, size=(n_series, periods))
+    shocks = rng.random((n_series, periods)) < 0.004
+    steps[shocks] -= rng.uniform(0.02, 0.12, size=shocks.sum())
+    levels = 30000 * np.exp(np.cumsum(steps, axis=1))
+
+    df = pd.DataFrame({
+        'series_id': np.repeat([f"SYN{i:04d}" for i in range(n_series)], periods),
+        'date': np.tile(dates.values, n_series),
+        'total_nonfarm': levels.ravel().round(1),
+    })
+    grouped = df.groupby('series_id', sort=False)['total_nonfarm']
+    df['mom_change_abs'] = grouped.diff()
+    df['mom_change_pct'] = (grouped.pct_change() * 100).round(2)
+    return df
@@ -0,0 +1,156 @@
+# charts.py
+
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+import profiling
+
+# Line charts with more points than this are downsampled and drawn with WebGL
+POINT_BUDGET = 5_000
+
+# --- Downsampling ---
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indices of `n_out` points that keep the shape of (x, y).
+
+    The first and last points are always kept; every bucket in between keeps the point
+    forming the largest triangle with the point kept before it and the next bucket's mean.
+    All buckets are scored at once: a first pass anchors each bucket on the previous
+    bucket's mean, a second on the point that pass kept from the previous bucket.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (n_out - 2)
+    # Bucket i covers [bounds[i], bounds[i + 1]); the last bucket is the final point alone
+    bounds = np.floor(np.arange(n_out - 1) * every).astype(np.int64) + 1
+    bounds[-1] = n - 1
+    sizes = np.diff(np.r_[bounds, n])
+    mean_x = np.add.reduceat(x, bounds) / sizes
+    mean_y = np.add.reduceat(y, bounds) / sizes
+
+    # Candidate positions of the inner buckets, padded to the widest one
+    starts, ends = bounds[:-1], bounds[1:]
+    candidates = starts[:, None] + np.arange(sizes[:-1].max())
+    valid = candidates < ends[:, None]
+    candidates = np.minimum(candidates, n - 1)
+    cand_x, cand_y = x[candidates], y[candidates]
+    next_x, next_y = mean_x[1:, None], mean_y[1:, None]
+
+    def pick(anchor_x, anchor_y):
+        anchor_x, anchor_y = anchor_x[:, None], anchor_y[:, None]
+        area = np.abs((anchor_x - next_x) * (cand_y - anchor_y) - (anchor_x - cand_x) * (next_y - anchor_y))
+        area[~valid] = -1
+        return candidates[np.arange(len(candidates)), np.argmax(area, axis=1)]
+
+    chosen = pick(np.r_[x[0], mean_x[:-2]], np.r_[y[0], mean_y[:-2]])
+    chosen = pick(np.r_[x[0], x[chosen[:-1]]], np.r_[y[0], y[chosen[:-1]]])
+    return np.r_[0, chosen, n - 1]
+
+def _numeric_axis(values):
+    """x values as float64 for the triangle areas, or None for categorical axes."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype='datetime64[ns]').astype('int64').astype('float64')
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype='float64')
+    return None
+
+def downsample(df, x, y, color=None, point_budget=POINT_BUDGET):
+    """Shrinks `df` to roughly `point_budget` rows, applying LTTB to each line separately."""
+    if color is None:
+        lines = [np.arange(len(df))]
+    else:
+        # Row positions of each line, in order of first appearance like px.line's traces
+        lines = sorted(df.groupby(color, sort=False, observed=True).indices.values(), key=lambda pos: pos[0])
+    if not lines:
+        return df
+    per_line = max(point_budget // len(lines), 3)
+    xs = _numeric_axis(df[x])
+    ys = df[y].to_numpy(dtype='float64')
+    keep = []
+    for pos in lines:
+        if len(pos) > per_line:
+            # Gaps can't be kept through LTTB; lines drawn in full keep theirs
+            pos = pos[~np.isnan(ys[pos])]
+        if len(pos) > per_line:
+            # Categorical axes fall back to the row position within the line
+            line_x = xs[pos] if xs is not None else np.arange(len(pos), dtype='float64')
+            pos = pos[lttb_indices(line_x, ys[pos], per_line)]
+        keep.append(pos)
+    return df.iloc[np.concatenate(keep)]
+
+# --- Line Charts ---
+def line_chart(df, x, y, color=None, point_budget=POINT_BUDGET, **kwargs):
+    """`px.line` that downsamples and switches to WebGL once `df` exceeds the point budget.
+
+    Returns the figure and a dict with the original and rendered point counts.
+    """
+    over_budget = len(df) > point_budget
+    data = df
+    if over_budget:
+        data = downsample(df, x, y, color, point_budget)
+        kwargs['render_mode'] = 'webgl'
+    fig = px.line(data, x=x, y=y, color=color, **kwargs)
+    return fig, {'original_points': len(df), 'rendered_points': len(data), 'webgl': over_budget}
+
+# --- Figure Memoization ---
+# Caches live here rather than in dashboard.py, which Streamlit re-executes on every
+# rerun; this module is imported once per process, so entries survive across reruns.
+FIGURE_CACHE_SIZE = 32
+_figure_caches = {}
+_figure_caches_lock = threading.Lock()
+
+def _freeze(value):
+    """Hashable form of a widget value (multiselects come back as lists)."""
+    if isinstance(value, (list, tuple, range)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def memoize_figure(max_entries=FIGURE_CACHE_SIZE):
+    """Memoizes a figure builder on its arguments, keeping the `max_entries` most recently used.
+
+    Like `st.cache_data`, arguments whose names start with an underscore (e.g. the shared
+    feature frame) are left out of the key, so builders take an explicit data version.
+    """
+    def decorator(build):
+        signature = inspect.signature(build)
+        name = build.__qualname__
+
+        @functools.wraps(build)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple((arg, _freeze(value)) for arg, value in bound.arguments.items() if not arg.startswith('_'))
+            with _figure_caches_lock:
+                cache = _figure_caches.setdefault(name, {'entries': OrderedDict(), 'hits': 0, 'misses': 0})
+                if key in cache['entries']:
+                    cache['hits'] += 1
+                    cache['entries'].move_to_end(key)
+                    return cache['entries'][key]
+                cache['misses'] += 1
+            with profiling.stage('figure', name):
+                figure = build(*args, **kwargs)
+            with _figure_caches_lock:
+                cache['entries'][key] = figure
+                while len(cache['entries']) > max_entries:
+                    cache['entries'].popitem(last=False)
+            return figure
+        return wrapper
+    return decorator
+
+def figure_cache_stats():
+    """Per-builder hits, misses and cached entry counts."""
+    with _figure_caches_lock:
+        return {name: {'hits': cache['hits'], 'misses': cache['misses'], 'entries': len(cache['entries'])}
+                for name, cache in _figure_caches.items()}
+
+def clear_figure_cache():
+    """Drops every memoized figure and resets the hit counters."""
+    with _figure_caches_lock:
+        _figure_caches.clear()
@@ -1,35 +1,150 @@
 import streamlit as st
 import pandas as pd
-import psycopg2
 import plotly.express as px
 import os
+import threading
+import time
+
+import profiling
+from drawdown import compute_drawdowns
+from engine import ENGINE, read_sql
+from charts import figure_cache_stats, line_chart, memoize_figure
+from features import MONTH_NAMES, append_features, build_features
+from queries import (
+    annual_growth_query, average_employment_query, date_bounds_query,
+    monthly_employment_query, quarterly_growth_query, series_rows_query, watermark_query
+)
+
+# Series shown by the dashboard; nonfarm_payrolls can hold several FRED series
+SERIES_ID = os.environ.get("SERIES_ID", "PAYEMS")
+
+# --- 1. Data Access & Caching ---
+# Queries run on the engine chosen with DASHBOARD_ENGINE (see engine.py): the live
+# PostgreSQL database, or in-process DuckDB over the ETL's Parquet snapshots.
+@st.cache_resource
+def get_data_cache():
+    """Process-wide payroll feature frame, versioned by the watermark `etl.py` writes to etl_loads."""
+    return {
+        'df': None,
+        'load_id': 0,
+        'max_date': None,
+        'hits': 0,
+        'misses': 0,
+        'last_refresh_seconds': None,
+        'last_refresh_mode': None,
+        'lock': threading.Lock()
+    }
+
+def fetch_watermark(since_load_id):
+    """Returns (latest load id, append-only?) for loads of SERIES_ID newer than `since_load_id`."""
+    watermark = read_sql(*watermark_query(SERIES_ID, since_load_id)).iloc[0]
+    if pd.isna(watermark['load_id']):
+        return None, None
+    return int(watermark['load_id']), bool(watermark['append_only'])
+
+def refresh_data_cache(cache):
+    """Brings the cache up to the latest ETL watermark, fetching only new rows when it can."""
+    latest_load_id, append_only = fetch_watermark(cache['load_id'])
+    if cache['df'] is not None and latest_load_id is None:
+        cache['hits'] += 1
+        return
+
+    start = time.perf_counter()
+    if cache['df'] is not None and append_only:
+        # Only appends since the cached watermark: fetch the new rows and add them on
+        new_rows = read_sql(*series_rows_query(SERIES_ID, after_date=cache['max_date']))
+        with profiling.stage('transform', 'append_features'):
+            df = append_features(cache['df'], new_rows)
+        cache['last_refresh_mode'] = f"incremental (+{len(new_rows)} rows)"
+    else:
+        # First load, or a full reload/restatement happened: fetch the whole table
+        rows = read_sql(*series_rows_query(SERIES_ID))
+        with profiling.stage('transform', 'build_features'):
+            df = build_features(rows)
+        cache['last_refresh_mode'] = f"full ({len(df)} rows)"
+        st.success("Data loaded and cached successfully!")
 
-# --- 1. Database Connection & Caching ---
-# IMPORTANT: Replace with your actual PostgreSQL connection details.
-# It is recommended to use environment variables for production.
-@st.cache_data
+    cache['df'] = df
+    cache['load_id'] = latest_load_id or cache['load_id']
+    # The watermark and the rows are separate reads, so a load committed in between can
+    # already be in `df`; the next incremental fetch starts after the rows actually held
+    cache['max_date'] = df['date'].max().date() if not df.empty else None
+    cache['misses'] += 1
+    cache['last_refresh_seconds'] = time.perf_counter() - start
+
+@profiling.profiled('db')
 def load_data():
-    """Connects to the PostgreSQL database, queries the nonfarm_payrolls table, and caches the data."""
+    """Returns the shared, read-only feature frame after a cheap per-rerun freshness check."""
+    cache = get_data_cache()
     try:
-        conn = psycopg2.connect(
-            dbname=os.environ.get("DB_NAME", "vani"),
-            user=os.environ.get("DB_USER", "postgres"),
-            password=os.environ.get("DB_PASSWORD", "Vani@08"),
-            host=os.environ.get("DB_HOST", "localhost")
-        )
-        query = "SELECT * FROM nonfarm_payrolls;"
-        df = pd.read_sql(query, conn)
-        conn.close()
-        
-        # Ensure the date column is in datetime format
-        df['date'] = pd.to_datetime(df['date'])
-        
-        st.success("Data loaded and cached successfully!")
-        return df
+        # The freshness check runs outside the lock, so reruns only queue behind a refresh
+        latest_load_id, _ = fetch_watermark(cache['load_id'])
+        if cache['df'] is not None and latest_load_id is None:
+            cache['hits'] += 1
+            return cache['df']
+        with cache['lock']:
+            # Checks again under the lock: another rerun may have applied this refresh already
+            refresh_data_cache(cache)
+        return cache['df']
     except Exception as e:
         st.error(f"Error connecting to the database or loading data: {e}")
         return None
 
+@st.cache_data(max_entries=256, show_spinner=False)
+def run_query(sql, params, data_version):
+    """Runs a parameterized slicer query; results are cached per (query, parameters, data version)."""
+    df = read_sql(sql, params)
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'])
+    return df
+
+def query_payrolls(query):
+    """Pushes a slicer query built in `queries.py` down to the database, stopping the page on errors."""
+    sql, params = query
+    try:
+        return run_query(sql, params, get_data_cache()['load_id'])
+    except Exception as e:
+        st.error(f"Error querying the database: {e}")
+        st.stop()
+
+def get_year_bounds():
+    """First and last year of data for the selected series, for sizing the year sliders."""
+    bounds = query_payrolls(date_bounds_query(SERIES_ID)).iloc[0]
+    return pd.Timestamp(bounds['min_date']).year, pd.Timestamp(bounds['max_date']).year
+
+@profiling.profiled('render')
+def show_chart(fig, points=None, **kwargs):
+    """Renders a figure, noting underneath when it was downsampled to fit the point budget."""
+    st.plotly_chart(fig, **kwargs)
+    if points and points['rendered_points'] < points['original_points']:
+        st.caption(f"Showing {points['rendered_points']:,} of {points['original_points']:,} points "
+                   "(shape-preserving downsampling, WebGL rendering).")
+
+@profiling.profiled('render')
+def show_table(df):
+    """Renders a DataFrame as a table."""
+    st.dataframe(df)
+
+def show_cache_stats():
+    """Shows data version, cache hit rate and the last refresh time in the sidebar."""
+    cache = get_data_cache()
+    lookups = cache['hits'] + cache['misses']
+    if not lookups:
+        return
+    st.sidebar.markdown("---")
+    st.sidebar.caption(f"Data version: load #{cache['load_id']} (through {cache['max_date']}), {ENGINE} engine")
+    st.sidebar.caption(f"Cache hit rate: {cache['hits'] / lookups:.0%} ({cache['hits']}/{lookups} reruns)")
+    if cache['last_refresh_seconds'] is not None:
+        st.sidebar.caption(f"Last refresh: {cache['last_refresh_mode']} in {cache['last_refresh_seconds'] * 1000:.0f} ms")
+
+    figure_stats = figure_cache_stats().values()
+    figure_hits = sum(stats['hits'] for stats in figure_stats)
+    figure_lookups = figure_hits + sum(stats['misses'] for stats in figure_stats)
+    if figure_lookups:
+        st.sidebar.caption(f"Figure cache hit rate: {figure_hits / figure_lookups:.0%} "
+                           f"({figure_hits}/{figure_lookups} charts, "
+                           f"{sum(stats['entries'] for stats in figure_stats)} cached)")
+
 # --- 2. Custom Styling ---
 def add_custom_css():
     """Injects custom CSS for styling the app."""
@@ -75,14 +190,141 @@ def add_custom_css():
     """, unsafe_allow_html=True)
 
 # --- 3. OLAP Analyses & Visualizations ---
+# Figure builders: each chart is built by a function of (data version, series, widget
+# values) only, memoized in charts.py, so a rerun rebuilds just the charts whose inputs
+# changed. Arguments starting with an underscore are left out of the cache key.
+QUARTER_MONTHS = {
+    'Q1': [1, 2, 3],
+    'Q2': [4, 5, 6],
+    'Q3': [7, 8, 9],
+    'Q4': [10, 11, 12]
+}
+
+# Custom color mapping for months
+QUARTER_MONTH_COLORS = {
+    'Q1': {'Jan': 'red', 'Feb': 'blue', 'Mar': 'green'},
+    'Q2': {'Apr': 'red', 'May': 'blue', 'Jun': 'green'},
+    'Q3': {'Jul': 'red', 'Aug': 'blue', 'Sep': 'green'},
+    'Q4': {'Oct': 'red', 'Nov': 'blue', 'Dec': 'green'}
+}
+
+def data_version():
+    """Load id of the data currently cached; part of every figure cache key."""
+    return get_data_cache()['load_id']
+
+@memoize_figure()
+def build_monthly_comparison_figure(version, series_id):
+    """Monthly employment for Mar-Dec 2020 vs. 2019 (no widget inputs)."""
+    df_slice2 = query_payrolls(monthly_employment_query(series_id, 2019, 2020, months=range(3, 13)))
+    return line_chart(df_slice2, x='date', y='total_nonfarm', color='year',
+                      title="Monthly Employment: March-December 2020 vs. 2019",
+                      labels={'total_nonfarm': 'Total Employment (in thousands)', 'date': 'Date'})
+
+@memoize_figure()
+def build_quarter_trend_figure(version, series_id, quarter, year_range):
+    """MoM % change of each month in `quarter` across the selected years."""
+    # Only the selected quarter's months in the year range come back from the database;
+    # month-over-month change is the one the ETL already stored (mom_change_pct)
+    df_quarter_interval = query_payrolls(
+        monthly_employment_query(series_id, year_range[0], year_range[1], months=QUARTER_MONTHS[quarter])
+    )
+    df_quarter_interval['month_name'] = [MONTH_NAMES[m - 1] for m in df_quarter_interval['month']]
+
+    # Line chart: one line per month in selected quarter
+    return line_chart(
+        df_quarter_interval,
+        x='year',
+        y='mom_change_pct',
+        color='month_name',
+        labels={'year': 'Year', 'mom_change_pct': 'MoM % Change', 'month_name': 'Month'},
+        color_discrete_map=QUARTER_MONTH_COLORS[quarter],
+        markers=True,
+        title=f"{quarter} Payroll Growth Trends by Month"
+    )
+
+@memoize_figure()
+def build_qoq_figure(version, series_id, selected_quarters, year_range):
+    """QoQ growth, one line per selected quarter."""
+    # Quarterly aggregation and QoQ growth, filtered to the selected quarters and years in SQL
+    df_quarter_filtered = query_payrolls(
+        quarterly_growth_query(series_id, year_range[0], year_range[1], selected_quarters)
+    )
+
+    # Line chart: one line per selected quarter
+    return line_chart(
+        df_quarter_filtered,
+        x='year',
+        y='qoq_growth',
+        color='quarter',
+        markers=True,
+        title=f"Quarter-over-Quarter Employment Growth Rate by Quarter",
+        labels={'year': 'Year', 'qoq_growth': 'QoQ Growth (%)', 'quarter': 'Quarter'},
+        color_discrete_map={1: 'red', 2: 'blue', 3: 'green', 4: 'orange'}
+    )
+
+@memoize_figure()
+def build_yoy_figure(version, series_id, year_range):
+    """YoY growth over the selected years."""
+    # Yearly aggregation and YoY growth over the selected years, computed in SQL
+    df_yearly_interval = query_payrolls(annual_growth_query(series_id, year_range[0], year_range[1]))
+    return line_chart(
+        df_yearly_interval,
+        x='year',
+        y='yoy_growth',
+        title="Year-over-Year Employment Growth Rate",
+        labels={'year': 'Year', 'yoy_growth': 'YoY Growth (%)'}
+    )
+
+@memoize_figure()
+def build_decades_figure(_df, version, series_id):
+    """Average employment in the 2000s vs. the 2010s (no widget inputs)."""
+    decade_2000s = _df[_df['year'].between(2000, 2009)]
+    decade_2010s = _df[_df['year'].between(2010, 2019)]
+    
+    avg_2000s = decade_2000s['total_nonfarm'].mean()
+    avg_2010s = decade_2010s['total_nonfarm'].mean()
+    
+    comparison_df = pd.DataFrame({
+        'Decade': ['2000s', '2010s'],
+        'Average Employment': [avg_2000s, avg_2010s]
+    })
+    
+    return px.bar(comparison_df, x='Decade', y='Average Employment', 
+                  title="Average Employment: 2000s vs. 2010s",
+                  labels={'Average Employment': 'Average Employment (in thousands)'})
+
+@memoize_figure()
+def build_drill_figure(_df, version, series_id, year, view_option):
+    """Monthly or quarterly employment within `year`."""
+    highest_gain_df = _df[_df['year'] == year]
+    highest_gain_df = highest_gain_df.assign(month=highest_gain_df['month_name'].astype(str))
+    if view_option == "Month":
+        return line_chart(
+            highest_gain_df,
+            x='month',
+            y='total_nonfarm',
+            markers=True,
+            title=f"Monthly Employment Contributions in {year}",
+            labels={'total_nonfarm': 'Total Employment (in thousands)', 'month': 'Month'}
+        )
+    quarterly_df = highest_gain_df.groupby('quarter')['total_nonfarm'].sum().reset_index()
+    return line_chart(
+        quarterly_df,
+        x='quarter',
+        y='total_nonfarm',
+        markers=True,
+        title=f"Quarterly Employment Contributions in {year}",
+        labels={'total_nonfarm': 'Total Employment (in thousands)', 'quarter': 'Quarter'}
+    )
+
+@profiling.profiled('render')
 def create_slicing_charts(df):
     """Performs and visualizes Slicing analyses."""
     st.header("Slicing Analysis")
 
     # Slicing 1: Average payroll employment by year (2010-2025)
     st.subheader("Average Jobs Created (Select Year Range)")
-    min_year = int(df['date'].dt.year.min())
-    max_year = int(df['date'].dt.year.max())
+    min_year, max_year = get_year_bounds()
     year_range = st.slider(
         "Select year range:",
         min_value=min_year,
@@ -90,91 +332,56 @@ def create_slicing_charts(df):
         value=(2010, 2025),
         step=1
     )
-    df_avg_jobs = df[(df['date'].dt.year >= year_range[0]) & (df['date'].dt.year <= year_range[1])]
-    avg_jobs_created = df_avg_jobs['total_nonfarm'].mean()
+    df_avg_jobs = query_payrolls(average_employment_query(SERIES_ID, year_range[0], year_range[1]))
+    with profiling.stage('transform', 'average_employment'):
+        avg_jobs_created = pd.to_numeric(df_avg_jobs['avg_employment']).iloc[0]
     st.metric(label=f"Average Jobs Created ({year_range[0]}-{year_range[1]})", value=f"{avg_jobs_created:,.0f}")
 
     # Slicing 2: Monthly employment comparison for Mar-Dec 2020 vs. 2019
     st.subheader("Monthly Employment Comparison (Mar-Dec 2020 vs. 2019)")
-    df['year'] = df['date'].dt.year
-    df['month'] = df['date'].dt.month
-    df_slice2 = df[((df['year'] == 2019) | (df['year'] == 2020)) & 
-                   (df['month'].between(3, 12))]
-    fig2 = px.line(df_slice2, x='date', y='total_nonfarm', color='year',
-                   title="Monthly Employment: March-December 2020 vs. 2019",
-                   labels={'total_nonfarm': 'Total Employment (in thousands)', 'date': 'Date'})
-    st.plotly_chart(fig2)
+    fig2, fig2_points = build_monthly_comparison_figure(data_version(), SERIES_ID)
+    show_chart(fig2, fig2_points)
 
+@profiling.profiled('render')
 def create_dicing_charts(df):
     """Performs and visualizes Dicing analyses."""
     st.header("Dicing Analysis")
 
     # Dicing 1: Months with > 2% month-over-month employment drop
     st.subheader("Months with > 2% Month-over-Month Employment Drop")
-    df['mom_growth'] = df['total_nonfarm'].pct_change() * 100
-    df['month_year'] = df['date'].dt.strftime('%b-%Y')
-    
-    significant_drops = df[df['mom_growth'] < -2].copy()
+    with profiling.stage('transform', 'significant_drops'):
+        significant_drops = df[df['mom_change_pct'] < -2]
+        drops_table = pd.DataFrame({
+            'month_year': significant_drops['date'].dt.strftime('%b-%Y'),
+            'MoM Growth (%)': significant_drops['mom_change_pct'].round(2)
+        })
     if not significant_drops.empty:
         st.write("Months with a greater than 2% month-over-month employment drop:")
-        st.dataframe(significant_drops[['month_year', 'mom_growth']].round(2).rename(columns={'mom_growth': 'MoM Growth (%)'}))
-        
-        # Calculate recovery time
-        recovery_data = []
-        for index, row in significant_drops.iterrows():
-            drop_date = row['date']
-            drop_employment = row['total_nonfarm']
-            
-            # Find the peak before the drop
-            pre_drop_data = df[df['date'] < drop_date]
-            if not pre_drop_data.empty:
-                prior_peak_employment = pre_drop_data['total_nonfarm'].max()
-                
-                # Find the first month where employment recovers to or exceeds the prior peak
-                post_drop_data = df[df['date'] > drop_date]
-                recovery_month = post_drop_data[post_drop_data['total_nonfarm'] >= prior_peak_employment].first_valid_index()
-                
-                if recovery_month:
-                    months_to_recover = (df.loc[recovery_month]['date'].year - drop_date.year) * 12 + (df.loc[recovery_month]['date'].month - drop_date.month)
-                    recovery_data.append({
-                        'Drop Month': row['month_year'],
-                        'Prior Peak Date': df.loc[pre_drop_data['total_nonfarm'].idxmax()]['date'].strftime('%b-%Y'),
-                        'Months to Recover': months_to_recover
-                    })
-                else:
-                    recovery_data.append({'Drop Month': row['month_year'], 'Prior Peak Date': 'N/A', 'Months to Recover': 'Not recovered yet'})
+        show_table(drops_table)
         
-        if recovery_data:
+        # Calculate recovery time for every drop in one vectorized pass
+        with profiling.stage('transform', 'compute_drawdowns'):
+            drawdowns = compute_drawdowns(df, threshold=-2, growth_col='mom_change_pct')
+            recovered = drawdowns['months_to_recover'].notna()
+            recovery_data = pd.DataFrame({
+                'Drop Month': drawdowns['drop_date'].dt.strftime('%b-%Y'),
+                'Prior Peak Date': drawdowns['prior_peak_date'].dt.strftime('%b-%Y').where(recovered, 'N/A'),
+                'Trough Month': drawdowns['trough_date'].dt.strftime('%b-%Y'),
+                'Months to Recover': drawdowns['months_to_recover'].astype(object).where(recovered, 'Not recovered yet')
+            })
+        if not recovery_data.empty:
             st.write("Time taken to recover to the prior peak:")
-            st.dataframe(pd.DataFrame(recovery_data))
+            show_table(recovery_data)
     else:
         st.info("No months found with a month-over-month employment drop greater than 2%.")
 
     # Dicing 2: Quarterly payroll growth trends
     st.subheader("Quarterly Payroll Growth Trends by Month")
-    # Calculate month-over-month percentage change for all months
-    df_all = df.copy()
-    df_all['year'] = df_all['date'].dt.year
-    df_all['month'] = df_all['date'].dt.strftime('%b')
-    df_all['month_num'] = df_all['date'].dt.month
-    df_all['pct_change_mom'] = df_all['total_nonfarm'].pct_change() * 100
-
     # Quarter selection dropdown
-    quarter_map = {
-        'Q1': [1, 2, 3],
-        'Q2': [4, 5, 6],
-        'Q3': [7, 8, 9],
-        'Q4': [10, 11, 12]
-    }
-    quarter = st.selectbox("Select Quarter for Analysis:", list(quarter_map.keys()), index=3)
-    selected_months = quarter_map[quarter]
-
-    # Filter for selected quarter months only
-    df_quarter = df_all[df_all['month_num'].isin(selected_months)].copy()
+    quarter = st.selectbox("Select Quarter for Analysis:", list(QUARTER_MONTHS.keys()), index=3)
 
     # Year slider
-    min_year = int(df_quarter['year'].min())
-    max_year = int(df_quarter['year'].max())
+    min_year, max_year = get_year_bounds()
     year_range = st.slider(
         f"Select year range for {quarter} analysis:",
         min_value=min_year,
@@ -182,30 +389,10 @@ def create_dicing_charts(df):
         value=(min_year, max_year),
         step=1
     )
-    df_quarter_interval = df_quarter[(df_quarter['year'] >= year_range[0]) & (df_quarter['year'] <= year_range[1])]
-
-    # Custom color mapping for months
-    color_map = {
-        'Q1': {'Jan': 'red', 'Feb': 'blue', 'Mar': 'green'},
-        'Q2': {'Apr': 'red', 'May': 'blue', 'Jun': 'green'},
-        'Q3': {'Jul': 'red', 'Aug': 'blue', 'Sep': 'green'},
-        'Q4': {'Oct': 'red', 'Nov': 'blue', 'Dec': 'green'}
-    }
-    month_color_map = color_map[quarter]
-
-    # Line chart: one line per month in selected quarter
-    fig3 = px.line(
-        df_quarter_interval,
-        x='year',
-        y='pct_change_mom',
-        color='month',
-        labels={'year': 'Year', 'pct_change_mom': 'MoM % Change', 'month': 'Month'},
-        color_discrete_map=month_color_map,
-        markers=True,
-        title=f"{quarter} Payroll Growth Trends by Month"
-    )
-    st.plotly_chart(fig3, use_container_width=True)
+    fig3, fig3_points = build_quarter_trend_figure(data_version(), SERIES_ID, quarter, year_range)
+    show_chart(fig3, fig3_points, use_container_width=True)
 
+@profiling.profiled('render')
 def create_roll_up_charts(df):
     """Performs and visualizes Roll-up analyses."""
     st.header("Roll-up Analysis")
@@ -213,12 +400,6 @@ def create_roll_up_charts(df):
     # Roll-up 1: Quarter-over-quarter and Year-over-year growth rates
     st.subheader("Quarter-over-Quarter (Q-o-Q) Employment Analysis")
 
-    # Quarterly aggregation
-    df_quarterly = df.set_index('date').resample('QS').mean()
-    df_quarterly['quarter'] = df_quarterly.index.quarter
-    df_quarterly['year'] = df_quarterly.index.year
-    df_quarterly['qoq_growth'] = df_quarterly['total_nonfarm'].pct_change() * 100
-
     # Checkbox interface for selecting quarters
     quarter_options = [1, 2, 3, 4]
     quarter_labels = [f"Q{q}" for q in quarter_options]
@@ -230,8 +411,7 @@ def create_roll_up_charts(df):
     )
 
     # Year slider for interval selection
-    min_year = int(df_quarterly['year'].min())
-    max_year = int(df_quarterly['year'].max())
+    min_year, max_year = get_year_bounds()
     year_range = st.slider(
         "Select year range for quarterly analysis:",
         min_value=min_year,
@@ -240,34 +420,12 @@ def create_roll_up_charts(df):
         step=1
     )
 
-    # Filter for selected quarters and year interval
-    df_quarter_filtered = df_quarterly[
-        (df_quarterly['quarter'].isin(selected_quarters)) &
-        (df_quarterly['year'] >= year_range[0]) &
-        (df_quarterly['year'] <= year_range[1])
-    ].reset_index()
-
-    # Line chart: one line per selected quarter
-    fig_qoq = px.line(
-        df_quarter_filtered,
-        x='year',
-        y='qoq_growth',
-        color='quarter',
-        markers=True,
-        title=f"Quarter-over-Quarter Employment Growth Rate by Quarter",
-        labels={'year': 'Year', 'qoq_growth': 'QoQ Growth (%)', 'quarter': 'Quarter'},
-        color_discrete_map={1: 'red', 2: 'blue', 3: 'green', 4: 'orange'}
-    )
-    st.plotly_chart(fig_qoq)
+    fig_qoq, fig_qoq_points = build_qoq_figure(data_version(), SERIES_ID, selected_quarters, year_range)
+    show_chart(fig_qoq, fig_qoq_points)
 
     # Annual Analysis
     st.subheader("Annual Analysis")
-    # Yearly aggregation
-    df_yearly = df.set_index('date').resample('A').mean()
-    df_yearly['year'] = df_yearly.index.year
-    df_yearly['yoy_growth'] = df_yearly['total_nonfarm'].pct_change() * 100
-    min_year_annual = int(df_yearly['year'].min())
-    max_year_annual = int(df_yearly['year'].max())
+    min_year_annual, max_year_annual = get_year_bounds()
     year_range_annual = st.slider(
         "Select year range for annual analysis:",
         min_value=min_year_annual,
@@ -275,75 +433,33 @@ def create_roll_up_charts(df):
         value=(min_year_annual, max_year_annual),
         step=1
     )
-    df_yearly_interval = df_yearly[(df_yearly['year'] >= year_range_annual[0]) & (df_yearly['year'] <= year_range_annual[1])].reset_index()
-    fig_yoy = px.line(
-        df_yearly_interval,
-        x='year',
-        y='yoy_growth',
-        title="Year-over-Year Employment Growth Rate",
-        labels={'year': 'Year', 'yoy_growth': 'YoY Growth (%)'}
-    )
-    st.plotly_chart(fig_yoy)
+    fig_yoy, fig_yoy_points = build_yoy_figure(data_version(), SERIES_ID, year_range_annual)
+    show_chart(fig_yoy, fig_yoy_points)
     
     # Roll-up 2: Compare average employment in 2010s vs. 2000s
     st.subheader("Average Employment in the 2000s vs. the 2010s")
-    df['year'] = df['date'].dt.year
-    decade_2000s = df[(df['year'] >= 2000) & (df['year'] <= 2009)]
-    decade_2010s = df[(df['year'] >= 2010) & (df['year'] <= 2019)]
-    
-    avg_2000s = decade_2000s['total_nonfarm'].mean()
-    avg_2010s = decade_2010s['total_nonfarm'].mean()
-    
-    comparison_df = pd.DataFrame({
-        'Decade': ['2000s', '2010s'],
-        'Average Employment': [avg_2000s, avg_2010s]
-    })
-    
-    fig_decades = px.bar(comparison_df, x='Decade', y='Average Employment', 
-                         title="Average Employment: 2000s vs. 2010s",
-                         labels={'Average Employment': 'Average Employment (in thousands)'})
-    st.plotly_chart(fig_decades)
+    fig_decades = build_decades_figure(df, data_version(), SERIES_ID)
+    show_chart(fig_decades)
 
+@profiling.profiled('render')
 def create_drill_down_charts(df):
     """Performs and visualizes Drill-down analyses."""
     st.header("Drill-down Analysis")
     
     # Drill-down 1: Year with highest annual employment gain
     st.subheader("Breakdown of Highest Annual Employment Gain")
-    df_annual = df.groupby(df['date'].dt.year)['total_nonfarm'].sum().reset_index()
-    df_annual['annual_gain'] = df_annual['total_nonfarm'].diff()
-    df_annual.columns = ['year', 'total_employment', 'annual_gain']
-    highest_gain_year = df_annual.loc[df_annual['annual_gain'].idxmax()]['year']
+    with profiling.stage('transform', 'annual_gain'):
+        df_annual = df.groupby('year')['total_nonfarm'].sum().reset_index()
+        df_annual['annual_gain'] = df_annual['total_nonfarm'].diff()
+        df_annual.columns = ['year', 'total_employment', 'annual_gain']
+        highest_gain_year = df_annual.loc[df_annual['annual_gain'].idxmax()]['year']
 
     st.write(f"The year with the highest annual employment gain was **{int(highest_gain_year)}**.")
 
-    # Drill-down into that year's monthly contributions
-    highest_gain_df = df[df['date'].dt.year == highest_gain_year].copy()
-    highest_gain_df['month'] = highest_gain_df['date'].dt.strftime('%b')
-    highest_gain_df['quarter'] = highest_gain_df['date'].dt.quarter
-
-    # Chart above, facts below
+    # Drill-down into that year's monthly contributions; chart above, facts below
     view_option = st.radio("View breakdown by:", options=["Month", "Quarter"], index=0)
-    if view_option == "Month":
-        fig_drill = px.line(
-            highest_gain_df,
-            x='month',
-            y='total_nonfarm',
-            markers=True,
-            title=f"Monthly Employment Contributions in {int(highest_gain_year)}",
-            labels={'total_nonfarm': 'Total Employment (in thousands)', 'month': 'Month'}
-        )
-    else:
-        quarterly_df = highest_gain_df.groupby('quarter')['total_nonfarm'].sum().reset_index()
-        fig_drill = px.line(
-            quarterly_df,
-            x='quarter',
-            y='total_nonfarm',
-            markers=True,
-            title=f"Quarterly Employment Contributions in {int(highest_gain_year)}",
-            labels={'total_nonfarm': 'Total Employment (in thousands)', 'quarter': 'Quarter'}
-        )
-    st.plotly_chart(fig_drill, use_container_width=True)
+    fig_drill, fig_drill_points = build_drill_figure(df, data_version(), SERIES_ID, int(highest_gain_year), view_option)
+    show_chart(fig_drill, fig_drill_points, use_container_width=True)
 
     # Facts section below chart, with CSS styling
     if int(highest_gain_year) == 2022:
@@ -411,17 +527,25 @@ def create_drill_down_charts(df):
     
     # Drill-down 2: Sharpest monthly drop
     st.subheader("Sharpest Monthly Employment Drop")
-    df['mom_drop'] = df['total_nonfarm'].diff()
-    sharpest_drop_month = df.loc[df['mom_drop'].idxmin()]
+    with profiling.stage('transform', 'sharpest_drop'):
+        sharpest_drop_month = df.loc[df['mom_change_abs'].idxmin()]
     
     st.write(f"The sharpest drop in employment occurred in **{sharpest_drop_month['date'].strftime('%B %Y')}**.")
-    st.write(f"The total payroll employment decreased by approximately **{sharpest_drop_month['mom_drop']:.2f} thousand** that month.")
+    st.write(f"The total payroll employment decreased by approximately **{sharpest_drop_month['mom_change_abs']:.2f} thousand** that month.")
     
     st.info("The available data is monthly. A weekly breakdown of this event is not possible with this dataset.")
 
 
 # --- 4. Main App Structure ---
 def main():
+    profiling.start_rerun('dashboard')
+    try:
+        render_app()
+    finally:
+        # Opt-in (PMS_PROFILE=1): per-rerun timing panel and JSONL trace
+        profiling.finish_rerun()
+
+def render_app():
     add_custom_css()
     st.title("U.S. Non-Farm Payrolls OLAP Analysis")
 
@@ -434,15 +558,17 @@ def main():
 
     data = load_data()
 
+    # Pages share the cached feature frame read-only; none of them copy or mutate it
     if data is not None:
         if menu_selection == "Slicing":
-            create_slicing_charts(data.copy())
+            create_slicing_charts(data)
         elif menu_selection == "Dicing":
-            create_dicing_charts(data.copy())
+            create_dicing_charts(data)
         elif menu_selection == "Roll-up":
-            create_roll_up_charts(data.copy())
+            create_roll_up_charts(data)
         elif menu_selection == "Drill-Down":
-            create_drill_down_charts(data.copy())
+            create_drill_down_charts(data)
+    show_cache_stats()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,117 @@
+# drawdown.py
+
+import numpy as np
+import pandas as pd
+
+
+# --- Drawdown & Recovery Engine ---
+def _first_at_least(values, start, end, target):
+    """For each query, the first position in [start, end) whose value is >= target, or -1."""
+    n = len(values)
+    # range_max[k][i] is the max of values[i:i + 2**k]
+    range_max = [values]
+    for k in range(int(np.max(end - start, initial=0)).bit_length() - 1):
+        level = range_max[-1]
+        step = 1 << k
+        range_max.append(np.maximum(level, np.r_[level[step:], np.full(min(step, n), -np.inf)]))
+
+    pos = start.copy()
+    for k in reversed(range(len(range_max))):
+        step = 1 << k
+        skip = pos + step <= end
+        skip[skip] = range_max[k][pos[skip]] < target[skip]
+        pos[skip] += step
+    return np.where(pos < end, pos, -1)
+
+def compute_drawdowns(df, threshold=-2.0, value_col='total_nonfarm', date_col='date',
+                      growth_col=None, series_col=None):
+    """Finds every month-over-month drop below `threshold` (in %) and, for each drop,
+    its prior peak, trough and the number of months taken to recover to that peak.
+
+    Works on one or many series at once (`series_col`) in a single vectorized pass:
+    running peaks come from a grouped cumulative max, and the recovery month of each
+    drop is located with a sorted search over the positions of the series' highs.
+    Returns one row per drop; recovery fields are NaN/NaT for drops not recovered yet.
+    """
+    sort_cols = [series_col, date_col] if series_col else [date_col]
+    data = df.sort_values(sort_cols, kind='mergesort').reset_index(drop=True)
+    n = len(data)
+
+    values = data[value_col].to_numpy(dtype='float64')
+    dates = pd.DatetimeIndex(data[date_col])
+    positions = np.arange(n)
+
+    if series_col:
+        keys = data[series_col].to_numpy()
+        group_start = np.r_[True, keys[1:] != keys[:-1]] if n else np.zeros(0, dtype=bool)
+    else:
+        group_start = positions == 0
+    group_id = np.cumsum(group_start) - 1
+    # Position one past the last row of each row's series
+    group_end = np.r_[positions[group_start][1:], n][group_id] if n else positions
+
+    value_series = pd.Series(values)
+    if growth_col:
+        growth = data[growth_col].to_numpy(dtype='float64')
+    else:
+        growth = (value_series.groupby(group_id).pct_change() * 100).to_numpy()
+
+    # Running peak and the (first) position it was reached at
+    running_max = value_series.groupby(group_id).cummax().to_numpy()
+    prev_max = np.where(group_start, -np.inf, np.r_[-np.inf, running_max[:-1]])
+    new_peak = values > prev_max
+    peak_pos = pd.Series(np.where(new_peak, positions, np.nan)).ffill().to_numpy()
+
+    # A month "recovers" when it reaches or exceeds the peak held before it
+    at_high = values >= prev_max
+    high_positions = positions[at_high & ~group_start]
+
+    # Drawdown episodes run from one high to the next; the trough after a drop is the
+    # suffix minimum of its episode, taken with a reversed grouped cummin
+    episode = np.cumsum(at_high)
+    reversed_frame = pd.DataFrame({'episode': episode[::-1], 'value': values[::-1],
+                                   'pos': positions[::-1]})
+    suffix_min = reversed_frame.groupby('episode')['value'].cummin()
+    is_low = reversed_frame['value'].to_numpy() <= suffix_min.to_numpy()
+    low_pos = pd.Series(np.where(is_low, reversed_frame['pos'].to_numpy(), np.nan))
+    trough_pos = low_pos.groupby(reversed_frame['episode'].to_numpy()).ffill().to_numpy()[::-1]
+
+    drop_idx = np.flatnonzero((growth < threshold) & ~group_start)
+    prior_peak_idx = peak_pos[drop_idx - 1].astype('int64')
+    prior_peak = running_max[drop_idx - 1]
+
+    next_high = np.searchsorted(high_positions, drop_idx, side='right')
+    recovery_idx = np.full(len(drop_idx), -1, dtype='int64')
+    found = next_high < len(high_positions)
+    recovery_idx[found] = high_positions[next_high[found]]
+    # A drop month that is itself at or above the prior peak (only possible with a
+    # positive threshold) moves the running high past that peak, so the next high is not
+    # its recovery: find the first later month back at the prior peak with a binary
+    # search over doubling range maxima instead
+    at_peak = values[drop_idx] >= prior_peak
+    if at_peak.any():
+        recovery_idx[at_peak] = _first_at_least(values, drop_idx[at_peak] + 1,
+                                               group_end[drop_idx[at_peak]], prior_peak[at_peak])
+        found[at_peak] = recovery_idx[at_peak] >= 0
+    recovered = found & (recovery_idx < group_end[drop_idx])
+
+    trough_idx = trough_pos[drop_idx].astype('int64')
+    drop_dates = dates[drop_idx]
+    recovery_dates = dates[np.maximum(recovery_idx, 0)].where(recovered)
+    months_to_recover = ((recovery_dates.year - drop_dates.year) * 12
+                         + (recovery_dates.month - drop_dates.month))
+
+    result = pd.DataFrame({
+        'drop_date': drop_dates,
+        'drop_value': values[drop_idx],
+        'mom_growth': growth[drop_idx],
+        'prior_peak_date': dates[prior_peak_idx],
+        'prior_peak': prior_peak,
+        'trough_date': dates[trough_idx],
+        'trough_value': values[trough_idx],
+        'recovery_date': recovery_dates,
+        'months_to_recover': pd.array(np.asarray(months_to_recover, dtype='float64'), dtype='Int64'),
+    })
+    if series_col:
+        result.insert(0, series_col, keys[drop_idx])
+    return result
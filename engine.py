@@ -0,0 +1,230 @@
+# engine.py
+
+import glob
+import os
+import re
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import psycopg2
+import psycopg2.pool
+
+import profiling
+from loader import COPY_CHUNK_ROWS, LOAD_COLUMNS
+
+# --- Engine Selection ---
+# "postgres" queries the live database; "duckdb" runs the same SQL in-process over the
+# Parquet snapshots etl.py writes after every load.
+ENGINE = os.environ.get("DASHBOARD_ENGINE", "postgres").lower()
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots"))
+ENGINES = ("postgres", "duckdb")
+# Connections the dashboard keeps open to PostgreSQL, shared by all sessions
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "4"))
+
+# IMPORTANT: Replace with your actual PostgreSQL connection details.
+# It is recommended to use environment variables for production.
+def _connection_params():
+    return {
+        'dbname': os.environ.get("DB_NAME", "vani"),
+        'user': os.environ.get("DB_USER", "postgres"),
+        'password': os.environ.get("DB_PASSWORD", "Vani@08"),
+        'host': os.environ.get("DB_HOST", "localhost"),
+    }
+
+def get_connection():
+    """Opens a connection to the PostgreSQL database holding the ETL output."""
+    return psycopg2.connect(**_connection_params())
+
+_pg_pool = None
+_pg_pool_lock = threading.Lock()
+# ThreadedConnectionPool raises instead of waiting when every connection is taken
+_pg_pool_slots = threading.BoundedSemaphore(DB_POOL_SIZE)
+
+@contextmanager
+def _pooled_connection():
+    """Borrows an autocommit connection from the process-wide pool, waiting for a free one."""
+    global _pg_pool
+    with _pg_pool_lock:
+        if _pg_pool is None:
+            _pg_pool = psycopg2.pool.ThreadedConnectionPool(1, DB_POOL_SIZE, **_connection_params())
+    with _pg_pool_slots:
+        conn = _pg_pool.getconn()
+        try:
+            # Reads only: no transaction is left open between queries
+            conn.autocommit = True
+            yield conn
+        finally:
+            # Connections the server dropped are discarded rather than handed out again
+            _pg_pool.putconn(conn, close=bool(conn.closed))
+
+# --- Parquet Snapshots ---
+# A snapshot is a series of generation directories (gen_*), each holding one part file
+# per load for every table plus etl_loads.parquet. CURRENT names the generation readers
+# use. Appends add a part to it; a full rewrite builds a new generation and switches
+# CURRENT to it, so a query sees the old rows or the new ones, never both.
+VALUE_COLUMNS = ('total_nonfarm', 'mom_change_abs', 'mom_change_pct')
+
+def _current_generation(snapshot_dir):
+    """Path of the generation CURRENT points at, or None before the first snapshot."""
+    try:
+        with open(os.path.join(snapshot_dir, "CURRENT")) as f:
+            return os.path.join(snapshot_dir, f.read().strip())
+    except FileNotFoundError:
+        return None
+
+def _table_dir(generation, table_name):
+    return os.path.join(generation, table_name)
+
+def _snapshot_schema():
+    import pyarrow as pa
+
+    return pa.schema([('series_id', pa.string()), ('date', pa.date32())]
+                     + [(column, pa.float64()) for column in VALUE_COLUMNS])
+
+def _snapshot_table(df):
+    """`df` as an Arrow table with the snapshot schema. Every part gets the same one: DATE
+    dates and float64 values, whether the rows come from the ETL frame or were read back
+    from PostgreSQL as Decimals."""
+    import pyarrow as pa
+
+    df = df.assign(date=pd.to_datetime(df['date']).dt.date).astype({column: 'float64' for column in VALUE_COLUMNS})
+    return pa.Table.from_pandas(df[list(LOAD_COLUMNS)], schema=_snapshot_schema(), preserve_index=False)
+
+def _parts(generation, table_name):
+    return sorted(glob.glob(os.path.join(_table_dir(generation, table_name), "*.parquet")))
+
+def _write_parquet(df, path):
+    """Writes `df` next to `path` and renames it into place, so readers never see a partial file."""
+    tmp_path = path + ".tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def has_snapshot(table_name, snapshot_dir=None):
+    """Whether the current snapshot generation holds at least one part for `table_name`."""
+    generation = _current_generation(snapshot_dir or SNAPSHOT_DIR)
+    return generation is not None and bool(_parts(generation, table_name))
+
+def snapshot_load_id(table_name='nonfarm_payrolls', snapshot_dir=None):
+    """Latest load of `table_name` recorded in the current snapshot's etl_loads.parquet, or None."""
+    generation = _current_generation(snapshot_dir or SNAPSHOT_DIR)
+    if generation is None or not os.path.exists(os.path.join(generation, "etl_loads.parquet")):
+        return None
+    loads = pd.read_parquet(os.path.join(generation, "etl_loads.parquet"), columns=['load_id', 'table_name'])
+    loads = loads[loads['table_name'] == table_name]
+    return int(loads['load_id'].max()) if not loads.empty else None
+
+def export_chunks(conn, table_name='nonfarm_payrolls', chunk_rows=COPY_CHUNK_ROWS):
+    """Yields `table_name` from PostgreSQL as DataFrames of `chunk_rows` rows.
+
+    Rows come through a server-side cursor, so only one chunk is held in memory.
+    """
+    with conn.cursor(name=f"{table_name}_export") as cur:
+        cur.itersize = chunk_rows
+        cur.execute(f"SELECT {', '.join(LOAD_COLUMNS)} FROM {table_name};")
+        while True:
+            rows = cur.fetchmany(chunk_rows)
+            if not rows:
+                break
+            yield pd.DataFrame(rows, columns=list(LOAD_COLUMNS))
+
+def write_snapshot(rows, loads, load_id, mode, table_name='nonfarm_payrolls', snapshot_dir=None, series_id=None):
+    """Adds one ETL load to the Parquet snapshot read by the in-process engine.
+
+    `rows` (a DataFrame, or an iterable of DataFrame chunks) are the rows the load wrote,
+    and `loads` the full etl_loads table after it. An append adds them as a part of the
+    current generation. A full load publishes a new generation holding `rows` as the
+    whole table, or with `series_id` as the whole of that series, the other series being
+    carried over from the current generation.
+    """
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    snapshot_dir = snapshot_dir or SNAPSHOT_DIR
+    chunks = [rows] if isinstance(rows, pd.DataFrame) else rows
+    part_name = f"load_{int(load_id):08d}.parquet"
+    current = _current_generation(snapshot_dir)
+
+    # An append with no snapshot yet starts one, like a full load
+    if mode == 'append' and current is not None:
+        table_dir = _table_dir(current, table_name)
+        os.makedirs(table_dir, exist_ok=True)
+        tmp_path = os.path.join(table_dir, part_name + ".tmp")
+        pq.write_table(_snapshot_table(pd.concat(list(chunks))), tmp_path)
+        os.replace(tmp_path, os.path.join(table_dir, part_name))
+        # The watermark is replaced last, so it never runs ahead of the data
+        _write_parquet(loads, os.path.join(current, "etl_loads.parquet"))
+        return
+
+    generation = os.path.join(snapshot_dir, f"gen_{int(load_id):08d}_{time.time_ns()}")
+    os.makedirs(_table_dir(generation, table_name))
+    writer = None
+    try:
+        writer = pq.ParquetWriter(os.path.join(_table_dir(generation, table_name), part_name), _snapshot_schema())
+        if series_id is not None and current is not None and _parts(current, table_name):
+            carried = ds.dataset(_parts(current, table_name), format='parquet', schema=writer.schema)
+            for batch in carried.to_batches(filter=ds.field('series_id') != series_id):
+                writer.write_batch(batch)
+        for chunk in chunks:
+            writer.write_table(_snapshot_table(chunk))
+        writer.close()
+        _write_parquet(loads, os.path.join(generation, "etl_loads.parquet"))
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        shutil.rmtree(generation, ignore_errors=True)
+        raise
+
+    pointer_path = os.path.join(snapshot_dir, "CURRENT")
+    with open(pointer_path + ".tmp", "w") as f:
+        f.write(os.path.basename(generation))
+    os.replace(pointer_path + ".tmp", pointer_path)
+    # Queries already running may still read the generation just replaced; older ones go
+    keep = {generation, current}
+    for old_generation in glob.glob(os.path.join(snapshot_dir, "gen_*")):
+        if old_generation not in keep:
+            shutil.rmtree(old_generation, ignore_errors=True)
+
+# --- Query Execution ---
+_duckdb_lock = threading.Lock()
+_duckdb_state = {'conn': None, 'generation': None}
+
+def _duckdb_cursor(snapshot_dir):
+    """Cursor on the process-wide in-memory DuckDB connection, with the current snapshot
+    generation's tables mounted as views (remounted whenever CURRENT moves)."""
+    import duckdb
+
+    generation = _current_generation(snapshot_dir)
+    if generation is None:
+        raise FileNotFoundError(f"No Parquet snapshot in {snapshot_dir}; run etl.py first.")
+    with _duckdb_lock:
+        if _duckdb_state['conn'] is None:
+            _duckdb_state['conn'] = duckdb.connect()
+        conn = _duckdb_state['conn']
+        if _duckdb_state['generation'] != generation:
+            table_glob = os.path.join(_table_dir(generation, 'nonfarm_payrolls'), "*.parquet")
+            conn.execute(f"CREATE OR REPLACE VIEW nonfarm_payrolls AS SELECT * FROM read_parquet('{table_glob}')")
+            conn.execute("CREATE OR REPLACE VIEW etl_loads AS SELECT * FROM "
+                         f"read_parquet('{os.path.join(generation, 'etl_loads.parquet')}')")
+            _duckdb_state['generation'] = generation
+        return conn.cursor()
+
+def read_sql(sql, params=None, engine=None):
+    """Runs `sql` (pyformat %(name)s parameters) on the selected engine and returns a DataFrame."""
+    engine = engine or ENGINE
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown DASHBOARD_ENGINE {engine!r}; expected one of {', '.join(ENGINES)}.")
+    with profiling.stage('db', f"read_sql ({engine})"):
+        if engine == "postgres":
+            with _pooled_connection() as conn:
+                result = pd.read_sql(sql, conn, params=params)
+        else:
+            cursor = _duckdb_cursor(SNAPSHOT_DIR)
+            try:
+                result = cursor.execute(re.sub(r"%\((\w+)\)s", r"$\1", sql), params or {}).df()
+            finally:
+                cursor.close()
+    profiling.count_query(len(result))
+    return result
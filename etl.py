@@ -1,7 +1,14 @@
+import numpy as np
 import pandas as pd
 from fredapi import Fred
 import psycopg2
-from io import StringIO
+import os
+
+from engine import export_chunks, has_snapshot, snapshot_load_id, write_snapshot
+from loader import LOAD_COLUMNS, load_rows
+
+# Set ETL_FULL_RELOAD=1 to replace the whole series (e.g. to pick up FRED revisions)
+FULL_RELOAD = os.environ.get("ETL_FULL_RELOAD", "") == "1"
 
 # --- Step 1: Extract ---
 print("--- Starting ETL Pipeline ---")
@@ -21,6 +28,9 @@ jobs_df = jobs_df.rename(columns={
     'change_abs': 'mom_change_abs',
     'change_pct': 'mom_change_pct'
 })
+jobs_df['series_id'] = series_id
+VALUE_COLUMNS = ('total_nonfarm', 'mom_change_abs', 'mom_change_pct')
+jobs_df = jobs_df[list(LOAD_COLUMNS)]
 
 # --- Step 3: Load ---
 print("Step 3: Loading transformed data into PostgreSQL...")
@@ -36,19 +46,100 @@ try:
     cursor = conn.cursor()
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS nonfarm_payrolls (
-            date DATE PRIMARY KEY,
+            series_id TEXT NOT NULL DEFAULT 'PAYEMS',
+            date DATE NOT NULL,
             total_nonfarm DECIMAL,
             mom_change_abs DECIMAL,
-            mom_change_pct DECIMAL
+            mom_change_pct DECIMAL,
+            PRIMARY KEY (series_id, date)
+        );
+    """)
+    # Tables created before series support are keyed on date alone. They are re-keyed on
+    # (series_id, date), which also serves the dashboard's pushed-down slicer queries
+    # (series + date range), by reloading them in full: the swapped-in staging table
+    # carries the new key
+    cursor.execute("ALTER TABLE nonfarm_payrolls ADD COLUMN IF NOT EXISTS series_id TEXT NOT NULL DEFAULT 'PAYEMS';")
+    cursor.execute("""
+        SELECT tc.constraint_name, kcu.column_name
+        FROM information_schema.table_constraints tc
+        JOIN information_schema.key_column_usage kcu
+          ON kcu.constraint_schema = tc.constraint_schema AND kcu.constraint_name = tc.constraint_name
+        WHERE tc.table_name = 'nonfarm_payrolls' AND tc.constraint_type = 'PRIMARY KEY'
+        ORDER BY kcu.ordinal_position;
+    """)
+    migrated = [column for _, column in cursor.fetchall()] != ['series_id', 'date']
+    # Load watermark read by dashboard.py to version its cache and refresh incrementally
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS etl_loads (
+            load_id SERIAL PRIMARY KEY,
+            table_name TEXT NOT NULL,
+            series_id TEXT NOT NULL,
+            max_date DATE NOT NULL,
+            row_count INTEGER NOT NULL,
+            mode TEXT NOT NULL,
+            loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
     """)
     conn.commit()
 
-    buffer = StringIO()
-    jobs_df.to_csv(buffer, index=False, header=False, sep='\t')
-    buffer.seek(0)
-    cursor.copy_from(buffer, 'nonfarm_payrolls', columns=('date', 'total_nonfarm', 'mom_change_abs', 'mom_change_pct'), sep='\t')
-    conn.commit()
+    # Only load months newer than what the table already holds, unless months already
+    # stored no longer match the fresh series: FRED revises history, and rows loaded
+    # before the COPY column order was fixed hold mom_change_pct and mom_change_abs in
+    # each other's columns. Either way the series is reloaded in full.
+    cursor.execute("SELECT date, total_nonfarm, mom_change_abs, mom_change_pct FROM nonfarm_payrolls WHERE series_id = %s;",
+                   (series_id,))
+    stored_df = pd.DataFrame(cursor.fetchall(), columns=['date', *VALUE_COLUMNS])
+    current_max_date = stored_df['date'].max() if not stored_df.empty else None
+    compared = jobs_df.merge(stored_df.assign(date=pd.to_datetime(stored_df['date'])), on='date', suffixes=('', '_stored'))
+    restated = any(
+        not np.allclose(compared[column], compared[f'{column}_stored'].astype('float64'), equal_nan=True)
+        for column in VALUE_COLUMNS
+    )
+    if restated:
+        print("Stored months differ from the fresh series; reloading it in full.")
+    if current_max_date is not None and not (FULL_RELOAD or migrated or restated):
+        new_rows_df = jobs_df[jobs_df['date'] > pd.Timestamp(current_max_date)]
+        load_mode = 'append'
+    else:
+        new_rows_df = jobs_df
+        load_mode = 'full'
+
+    cursor.execute("SELECT MAX(load_id) FROM etl_loads WHERE table_name = 'nonfarm_payrolls';")
+    previous_load_id = cursor.fetchone()[0]
+    latest_load_id = previous_load_id
+
+    if new_rows_df.empty:
+        print("No new months to load; table is already up to date.")
+    else:
+        # Streamed into a staging table and validated; published by the commit below
+        load_rows(conn, new_rows_df, series_id, load_mode, after_date=current_max_date)
+        # Written in the same transaction as the rows, so the watermark never runs ahead of the data
+        cursor.execute(
+            "INSERT INTO etl_loads (table_name, series_id, max_date, row_count, mode) VALUES (%s, %s, %s, %s, %s) RETURNING load_id;",
+            ('nonfarm_payrolls', series_id, new_rows_df['date'].max().date(), len(new_rows_df), load_mode)
+        )
+        latest_load_id = cursor.fetchone()[0]
+        conn.commit()
+        print(f"Loaded {len(new_rows_df)} new rows ({load_mode}).")
+
+    # Parquet snapshot for the dashboard's in-process (DuckDB) engine. When it was in sync
+    # before the load it only takes this run's rows (a full reload replaces this series and
+    # carries the others over); a missing snapshot, or one left behind by a failed write,
+    # is rebuilt from everything the table holds, streamed a chunk at a time
+    try:
+        snapshot_at = snapshot_load_id('nonfarm_payrolls') if has_snapshot('nonfarm_payrolls') else -1
+        if snapshot_at == latest_load_id:
+            print("Parquet snapshot is up to date.")
+        else:
+            loads_df = pd.read_sql("SELECT * FROM etl_loads;", conn)
+            if latest_load_id != previous_load_id and snapshot_at == previous_load_id:
+                write_snapshot(new_rows_df, loads_df, latest_load_id, load_mode, series_id=series_id)
+                print(f"Parquet snapshot updated ({load_mode}).")
+            else:
+                write_snapshot(export_chunks(conn), loads_df, latest_load_id or 0, 'full')
+                print("Parquet snapshot rebuilt from the table.")
+    except ImportError as e:
+        print(f"Skipping Parquet snapshot ({e}); only the postgres dashboard engine will see this load.")
 
     print("Data successfully loaded!")
 except Exception as e:
@@ -0,0 +1,32 @@
+# features.py
+
+import pandas as pd
+
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+# --- Derived Feature Frame ---
+def build_features(df):
+    """Builds the shared feature frame every dashboard page reads from.
+
+    Calendar columns are derived once and stored as compact dtypes (int16 year, int8
+    month/quarter, categorical month name), and the growth columns the ETL already
+    stored (mom_change_abs, mom_change_pct) are reused instead of recomputed. Pages
+    receive this frame without copying it, so they must treat it as read-only.
+    """
+    dates = pd.to_datetime(df['date'])
+    months = dates.dt.month.to_numpy(dtype='int8')
+    features = pd.DataFrame({
+        'date': dates.to_numpy(),
+        'total_nonfarm': df['total_nonfarm'].to_numpy(dtype='float64'),
+        'mom_change_abs': df['mom_change_abs'].to_numpy(dtype='float64'),
+        'mom_change_pct': df['mom_change_pct'].to_numpy(dtype='float64'),
+        'year': dates.dt.year.to_numpy(dtype='int16'),
+        'month': months,
+        'quarter': ((months - 1) // 3 + 1).astype('int8'),
+        'month_name': pd.Categorical.from_codes(months - 1, categories=MONTH_NAMES, ordered=True),
+    })
+    return features
+
+def append_features(features, new_rows):
+    """Returns `features` extended with the derived features of `new_rows`."""
+    return pd.concat([features, build_features(new_rows)], ignore_index=True)
@@ -0,0 +1,122 @@
+# loader.py
+
+import re
+
+# --- Load Stage ---
+# Rows reach nonfarm_payrolls through a staging table: they are streamed in with COPY
+# a chunk at a time, validated, and only then published in the same transaction that
+# records the load in etl_loads. Readers see the old rows or the new ones, never a mix.
+LOAD_COLUMNS = ('series_id', 'date', 'total_nonfarm', 'mom_change_abs', 'mom_change_pct')
+COPY_CHUNK_ROWS = 50_000
+
+class ChunkedCopySource:
+    """File-like object feeding COPY ... FROM STDIN, rendering CSV for one chunk of rows at a time."""
+
+    def __init__(self, df, columns=LOAD_COLUMNS, chunk_rows=COPY_CHUNK_ROWS):
+        self._chunks = (
+            df.iloc[start:start + chunk_rows].to_csv(columns=list(columns), header=False, index=False).encode()
+            for start in range(0, len(df), chunk_rows)
+        )
+        self._chunk = b''
+        self._pos = 0
+
+    def read(self, size=-1):
+        # COPY reads in small blocks; hand out slices of the current chunk instead of
+        # joining chunks, so at most one chunk's text is alive at any time
+        if self._pos >= len(self._chunk):
+            self._chunk = next(self._chunks, b'')
+            self._pos = 0
+        end = len(self._chunk) if size is None or size < 0 else self._pos + size
+        data = self._chunk[self._pos:end]
+        self._pos += len(data)
+        return data
+
+def stream_copy(cursor, df, table_name, columns=LOAD_COLUMNS, chunk_rows=COPY_CHUNK_ROWS):
+    """COPYs `df` into `table_name` chunk by chunk, without building the whole text in memory."""
+    cursor.copy_expert(
+        f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+        ChunkedCopySource(df, columns, chunk_rows)
+    )
+
+def validate_staging(cursor, staging_name, expected_rows, series_id=None, after_date=None):
+    """Checks the staged rows (of `series_id`, or all of them) before they are published.
+
+    Raises ValueError if the row count is off, a value is missing, or an append overlaps
+    rows already loaded.
+    """
+    where, params = ("WHERE series_id = %s", (series_id,)) if series_id is not None else ("", None)
+    cursor.execute(f"SELECT COUNT(*), COUNT(*) - COUNT(total_nonfarm), MIN(date) FROM {staging_name} {where};", params)
+    staged_rows, missing_values, min_date = cursor.fetchone()
+    problems = []
+    if staged_rows != expected_rows:
+        problems.append(f"staged {staged_rows} rows, expected {expected_rows}")
+    if missing_values:
+        problems.append(f"{missing_values} rows without total_nonfarm")
+    if after_date is not None and min_date is not None and min_date <= after_date:
+        problems.append(f"rows from {min_date} overlap data already loaded through {after_date}")
+    if problems:
+        raise ValueError(f"Staged load of {series_id or 'all series'} failed validation: {'; '.join(problems)}.")
+
+def copy_indexes_and_grants(cursor, table_name, staging_name):
+    """Recreates `table_name`'s secondary indexes and grants on `staging_name` before a swap.
+
+    The indexes get temporary names, since the originals still exist; returns the
+    (temporary, original) name pairs to rename once the old table is dropped.
+    """
+    cursor.execute(
+        "SELECT c.relname, pg_get_indexdef(i.indexrelid) FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE i.indrelid = %s::regclass AND NOT i.indisprimary;",
+        (table_name,)
+    )
+    renames = []
+    for index_name, definition in cursor.fetchall():
+        staging_index = f"{index_name[:55]}_staging"
+        cursor.execute(re.sub(r"^CREATE (UNIQUE )?INDEX \S+ ON \S+ ",
+                              lambda m: f"CREATE {m.group(1) or ''}INDEX {staging_index} ON {staging_name} ", definition))
+        renames.append((staging_index, index_name))
+
+    cursor.execute(
+        "SELECT CASE WHEN a.grantee = 0 THEN 'PUBLIC' ELSE quote_ident(pg_get_userbyid(a.grantee)) END, a.privilege_type "
+        "FROM pg_class c, aclexplode(c.relacl) a WHERE c.oid = %s::regclass AND a.grantee <> c.relowner;",
+        (table_name,)
+    )
+    for grantee, privilege in cursor.fetchall():
+        cursor.execute(f"GRANT {privilege} ON {staging_name} TO {grantee};")
+    return renames
+
+def load_rows(conn, df, series_id, mode, after_date=None, table_name='nonfarm_payrolls', chunk_rows=COPY_CHUNK_ROWS):
+    """Loads rows through a staging table, leaving the transaction open for the caller.
+
+    'append' adds rows newer than `after_date`; 'full' rebuilds the table with `df` as the
+    whole of `series_id` (other series are carried over) and swaps it in for the old one.
+    With `series_id=None`, `df` holds every series and a full load replaces the table.
+    The caller records the load and commits, which publishes the rows.
+    """
+    staging_name = f"{table_name}_staging"
+    with conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {staging_name};")
+        cur.execute(f"CREATE TABLE {staging_name} (LIKE {table_name} INCLUDING DEFAULTS);")
+        columns = ', '.join(LOAD_COLUMNS)
+        if mode == 'full' and series_id is not None:
+            cur.execute(f"INSERT INTO {staging_name} ({columns}) SELECT {columns} FROM {table_name} WHERE series_id <> %s;",
+                        (series_id,))
+        stream_copy(cur, df, staging_name, chunk_rows=chunk_rows)
+        # Building the key after the bulk load is cheaper than maintaining it row by row,
+        # and it rejects duplicate or missing (series_id, date) keys
+        cur.execute(f"ALTER TABLE {staging_name} ADD CONSTRAINT {staging_name}_pkey PRIMARY KEY (series_id, date);")
+        validate_staging(cur, staging_name, len(df), series_id, after_date if mode == 'append' else None)
+
+        if mode == 'full':
+            index_renames = copy_indexes_and_grants(cur, table_name, staging_name)
+            # Swap: readers keep seeing the old table until commit; queries waiting on the
+            # lock look the name up again afterwards and read the new one
+            cur.execute(f"ANALYZE {staging_name};")
+            cur.execute(f"DROP TABLE {table_name};")
+            cur.execute(f"ALTER TABLE {staging_name} RENAME TO {table_name};")
+            cur.execute(f"ALTER TABLE {table_name} RENAME CONSTRAINT {staging_name}_pkey TO {table_name}_pkey;")
+            for staging_index, index_name in index_renames:
+                cur.execute(f"ALTER INDEX {staging_index} RENAME TO {index_name};")
+        else:
+            cur.execute(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {staging_name};")
+            cur.execute(f"DROP TABLE {staging_name};")
+    return len(df)
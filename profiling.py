@@ -0,0 +1,129 @@
+# profiling.py
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+# --- Configuration ---
+# Opt-in: set PMS_PROFILE=1 to profile every rerun of frontend.py and dashboard.py.
+PROFILE_ENABLED = os.environ.get("PMS_PROFILE", "").lower() in ("1", "true", "yes", "on")
+TRACE_PATH = os.environ.get("PMS_PROFILE_TRACE", "profile_trace.jsonl")
+CATEGORIES = ("db", "transform", "figure", "render")
+
+_local = threading.local()
+_trace_lock = threading.Lock()
+
+def _current():
+    """The profile of the rerun running on this thread, or None."""
+    return getattr(_local, 'profile', None)
+
+# --- Rerun Lifecycle ---
+def start_rerun(app):
+    """Starts profiling a rerun of `app` on the current thread (no-op unless enabled)."""
+    if not PROFILE_ENABLED:
+        return
+    _local.profile = {
+        'app': app,
+        'started_at': datetime.now(timezone.utc).isoformat(),
+        'start': time.perf_counter(),
+        'stages': [],
+        'stack': [],
+        'queries': 0,
+        'rows': 0,
+    }
+
+def finish_rerun():
+    """Closes the current rerun's profile, shows it in a collapsible panel and appends it to the trace file."""
+    profile = _current()
+    if profile is None:
+        return
+    _local.profile = None
+    record = _summarize(profile)
+    with _trace_lock, open(TRACE_PATH, 'a') as trace:
+        trace.write(json.dumps(record) + "\n")
+    _render_panel(record)
+
+def _summarize(profile):
+    total_ms = (time.perf_counter() - profile['start']) * 1000
+    by_category = {category: 0.0 for category in CATEGORIES}
+    by_label = {}
+    for category, label, exclusive_ms in profile['stages']:
+        by_category[category] += exclusive_ms
+        key = (category, label)
+        calls, ms = by_label.get(key, (0, 0.0))
+        by_label[key] = (calls + 1, ms + exclusive_ms)
+    by_category['other'] = max(total_ms - sum(by_category.values()), 0.0)
+    return {
+        'app': profile['app'],
+        'started_at': profile['started_at'],
+        'total_ms': round(total_ms, 2),
+        'categories_ms': {category: round(ms, 2) for category, ms in by_category.items()},
+        'queries': profile['queries'],
+        'rows': profile['rows'],
+        'stages': [{'category': category, 'label': label, 'calls': calls, 'ms': round(ms, 2)}
+                   for (category, label), (calls, ms) in sorted(by_label.items(), key=lambda item: -item[1][1])],
+    }
+
+def _render_panel(record):
+    import pandas as pd
+    import streamlit as st
+
+    with st.expander(f"Profiling: {record['total_ms']:.0f} ms this rerun, "
+                     f"{record['queries']} queries, {record['rows']:,} rows"):
+        st.dataframe(pd.DataFrame({
+            'Category': list(record['categories_ms'].keys()),
+            'Time (ms)': list(record['categories_ms'].values()),
+        }), hide_index=True)
+        if record['stages']:
+            st.dataframe(pd.DataFrame(record['stages']), hide_index=True)
+        st.caption(f"Appended to {TRACE_PATH}")
+
+# --- Stages ---
+@contextlib.contextmanager
+def _timed_stage(profile, category, label):
+    # Time spent in nested stages is charged to them, not to the enclosing stage
+    frame = {'child_ms': 0.0}
+    profile['stack'].append(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        profile['stack'].pop()
+        if profile['stack']:
+            profile['stack'][-1]['child_ms'] += elapsed_ms
+        profile['stages'].append((category, label, elapsed_ms - frame['child_ms']))
+
+def stage(category, label):
+    """Context manager charging the enclosed time to `category` (db, transform, figure or render)."""
+    profile = _current()
+    if profile is None:
+        return contextlib.nullcontext()
+    return _timed_stage(profile, category, label)
+
+def profiled(category, label=None):
+    """Decorator form of `stage`, labelled with the function name by default."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(category, label or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def count_query(rows=0):
+    """Counts one database query returning `rows` rows in the current rerun."""
+    profile = _current()
+    if profile is not None:
+        profile['queries'] += 1
+        profile['rows'] += rows
+
+def count_query_rows(rows):
+    """Adds fetched rows to the current rerun without counting another query."""
+    profile = _current()
+    if profile is not None:
+        profile['rows'] += rows
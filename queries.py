@@ -0,0 +1,116 @@
+# queries.py
+
+from datetime import date
+
+# --- Query Builders ---
+# Each builder turns dashboard state into (sql, params) for the nonfarm_payrolls table.
+# Filters are pushed down as half-open date ranges so they stay backed by the
+# (series_id, date) index, and every value travels as a bound parameter. The SQL sticks
+# to what both engines in engine.py (PostgreSQL and DuckDB) accept unchanged.
+TABLE_NAME = 'nonfarm_payrolls'
+
+def _in_list(column, name, values, params):
+    """Expands `values` into a `column IN (...)` clause with one named parameter per value."""
+    placeholders = []
+    for i, value in enumerate(values):
+        key = f"{name}_{i}"
+        params[key] = int(value)
+        placeholders.append(f"%({key})s")
+    return f"{column} IN ({', '.join(placeholders)})"
+
+def _year_bounds(start_year, end_year):
+    """Half-open [start, end) date range covering whole calendar years."""
+    return date(int(start_year), 1, 1), date(int(end_year) + 1, 1, 1)
+
+def watermark_query(series_id, since_load_id):
+    """Latest ETL load of a series newer than `since_load_id`, and whether every such load only appended rows."""
+    sql = ("SELECT MAX(load_id) AS load_id, MAX(max_date) AS max_date, "
+           "BOOL_AND(mode = 'append') AS append_only FROM etl_loads "
+           f"WHERE table_name = '{TABLE_NAME}' AND series_id = %(series_id)s AND load_id > %(since_load_id)s")
+    return sql, {'series_id': series_id, 'since_load_id': int(since_load_id)}
+
+def series_rows_query(series_id, after_date=None):
+    """All rows of a series, or only those after `after_date` for an incremental refresh."""
+    params = {'series_id': series_id}
+    where = "series_id = %(series_id)s"
+    if after_date is not None:
+        where += " AND date > %(after_date)s"
+        params['after_date'] = after_date
+    return f"SELECT * FROM {TABLE_NAME} WHERE {where} ORDER BY date", params
+
+def date_bounds_query(series_id):
+    """First and last date held for a series, used to size the year sliders."""
+    sql = (f"SELECT MIN(date) AS min_date, MAX(date) AS max_date FROM {TABLE_NAME} "
+           "WHERE series_id = %(series_id)s")
+    return sql, {'series_id': series_id}
+
+def average_employment_query(series_id, start_year, end_year):
+    """Average total_nonfarm over a year range."""
+    start_date, end_date = _year_bounds(start_year, end_year)
+    sql = (f"SELECT CAST(AVG(total_nonfarm) AS DOUBLE PRECISION) AS avg_employment FROM {TABLE_NAME} "
+           "WHERE series_id = %(series_id)s AND date >= %(start_date)s AND date < %(end_date)s")
+    return sql, {'series_id': series_id, 'start_date': start_date, 'end_date': end_date}
+
+def monthly_employment_query(series_id, start_year, end_year, months=None):
+    """Monthly rows in a year range, optionally restricted to some months of the year."""
+    start_date, end_date = _year_bounds(start_year, end_year)
+    params = {'series_id': series_id, 'start_date': start_date, 'end_date': end_date}
+    where = "series_id = %(series_id)s AND date >= %(start_date)s AND date < %(end_date)s"
+    if months:
+        where += " AND " + _in_list("CAST(EXTRACT(MONTH FROM date) AS INTEGER)", 'month', months, params)
+    sql = ("SELECT date, CAST(EXTRACT(YEAR FROM date) AS INTEGER) AS year, "
+           "CAST(EXTRACT(MONTH FROM date) AS INTEGER) AS month, "
+           "CAST(total_nonfarm AS DOUBLE PRECISION) AS total_nonfarm, "
+           "CAST(mom_change_pct AS DOUBLE PRECISION) AS mom_change_pct "
+           f"FROM {TABLE_NAME} WHERE {where} ORDER BY date")
+    return sql, params
+
+def quarterly_growth_query(series_id, start_year, end_year, quarters):
+    """Quarterly average employment and QoQ growth for the chosen quarters and years.
+
+    The scan starts one quarter early so the first selected quarter still has the
+    previous quarter to compute its growth against.
+    """
+    start_date, end_date = _year_bounds(start_year, end_year)
+    params = {'series_id': series_id, 'scan_start': date(start_date.year - 1, 10, 1),
+              'end_date': end_date, 'start_year': int(start_year)}
+    quarter_filter = _in_list("quarter", 'quarter', quarters, params) if quarters else "FALSE"
+    sql = f"""
+        SELECT year, quarter, total_nonfarm, qoq_growth FROM (
+            SELECT year, quarter, total_nonfarm,
+                   (total_nonfarm / LAG(total_nonfarm) OVER (ORDER BY year, quarter) - 1) * 100 AS qoq_growth
+            FROM (
+                SELECT CAST(EXTRACT(YEAR FROM date) AS INTEGER) AS year,
+                       CAST(EXTRACT(QUARTER FROM date) AS INTEGER) AS quarter,
+                       CAST(AVG(total_nonfarm) AS DOUBLE PRECISION) AS total_nonfarm
+                FROM {TABLE_NAME}
+                WHERE series_id = %(series_id)s AND date >= %(scan_start)s AND date < %(end_date)s
+                GROUP BY 1, 2
+            ) quarterly
+        ) growth
+        WHERE year >= %(start_year)s AND {quarter_filter}
+        ORDER BY year, quarter
+    """
+    return sql, params
+
+def annual_growth_query(series_id, start_year, end_year):
+    """Annual average employment and YoY growth for a year range (scanning one extra prior year)."""
+    start_date, end_date = _year_bounds(start_year, end_year)
+    params = {'series_id': series_id, 'scan_start': date(start_date.year - 1, 1, 1),
+              'end_date': end_date, 'start_year': int(start_year)}
+    sql = f"""
+        SELECT year, total_nonfarm, yoy_growth FROM (
+            SELECT year, total_nonfarm,
+                   (total_nonfarm / LAG(total_nonfarm) OVER (ORDER BY year) - 1) * 100 AS yoy_growth
+            FROM (
+                SELECT CAST(EXTRACT(YEAR FROM date) AS INTEGER) AS year,
+                       CAST(AVG(total_nonfarm) AS DOUBLE PRECISION) AS total_nonfarm
+                FROM {TABLE_NAME}
+                WHERE series_id = %(series_id)s AND date >= %(scan_start)s AND date < %(end_date)s
+                GROUP BY 1
+            ) yearly
+        ) growth
+        WHERE year >= %(start_year)s
+        ORDER BY year
+    """
+    return sql, params
@@ -0,0 +1,133 @@
+# tests/test_engine_parity.py
+#
+# Checks that every query shape in queries.py returns the same result on the in-process
+# DuckDB engine as a plain pandas computation over the same rows. Needs no database
+# server; latency against PostgreSQL is measured by benchmarks/bench_engines.py. Run
+# from the repository root:
+#
+#     python -m pytest tests
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('duckdb')
+pytest.importorskip('pyarrow')
+
+import engine
+import queries
+from benchmarks.olap_suite import seed_snapshot
+from benchmarks.synthetic import make_payroll_frame
+
+SERIES_ID = 'SYN0001'
+MIN_YEAR, MID_YEAR, MAX_YEAR = 1939, 1960, 1988
+
+
+@pytest.fixture(scope='module')
+def payrolls(tmp_path_factory):
+    """Three synthetic series written to a temporary snapshot; yields the rows of SERIES_ID."""
+    df = make_payroll_frame(1800, n_series=3)
+    snapshot_dir = str(tmp_path_factory.mktemp('snapshot'))
+    seed_snapshot(df, snapshot_dir)
+    previous_dir, engine.SNAPSHOT_DIR = engine.SNAPSHOT_DIR, snapshot_dir
+    yield df[df['series_id'] == SERIES_ID].sort_values('date').reset_index(drop=True)
+    engine.SNAPSHOT_DIR = previous_dir
+
+
+# --- pandas references ---
+def in_years(df, start_year, end_year, scan_from=None):
+    return df[df['date'].dt.year.between(scan_from or start_year, end_year)]
+
+def expected_watermark(df):
+    # seed_snapshot records one full load per series, in series order
+    return pd.DataFrame({'load_id': [2], 'max_date': [df['date'].max()], 'append_only': [False]})
+
+def expected_monthly(df, start_year, end_year, months=None):
+    rows = in_years(df, start_year, end_year)
+    if months:
+        rows = rows[rows['date'].dt.month.isin(list(months))]
+    return pd.DataFrame({'date': rows['date'], 'year': rows['date'].dt.year, 'month': rows['date'].dt.month,
+                         'total_nonfarm': rows['total_nonfarm'], 'mom_change_pct': rows['mom_change_pct']})
+
+def expected_quarterly(df, start_year, end_year, quarters):
+    rows = in_years(df, start_year, end_year, scan_from=start_year - 1)
+    rows = rows[rows['date'] >= pd.Timestamp(start_year - 1, 10, 1)]
+    quarterly = rows.groupby([rows['date'].dt.year.rename('year'), rows['date'].dt.quarter.rename('quarter')])
+    result = quarterly['total_nonfarm'].mean().reset_index()
+    result['qoq_growth'] = result['total_nonfarm'].pct_change() * 100
+    return result[(result['year'] >= start_year) & result['quarter'].isin(quarters)]
+
+def expected_annual(df, start_year, end_year):
+    rows = in_years(df, start_year, end_year, scan_from=start_year - 1)
+    result = rows.groupby(rows['date'].dt.year.rename('year'))['total_nonfarm'].mean().reset_index()
+    result['yoy_growth'] = result['total_nonfarm'].pct_change() * 100
+    return result[result['year'] >= start_year]
+
+CASES = [
+    ("watermark", queries.watermark_query(SERIES_ID, 0), expected_watermark),
+    ("series rows", queries.series_rows_query(SERIES_ID), lambda df: df),
+    ("series rows (incremental)", queries.series_rows_query(SERIES_ID, after_date=date(MID_YEAR, 1, 1)),
+     lambda df: df[df['date'] > pd.Timestamp(MID_YEAR, 1, 1)]),
+    ("date bounds", queries.date_bounds_query(SERIES_ID),
+     lambda df: pd.DataFrame({'min_date': [df['date'].min()], 'max_date': [df['date'].max()]})),
+    ("average (all years)", queries.average_employment_query(SERIES_ID, MIN_YEAR, MAX_YEAR),
+     lambda df: pd.DataFrame({'avg_employment': [in_years(df, MIN_YEAR, MAX_YEAR)['total_nonfarm'].mean()]})),
+    ("average (10 years)", queries.average_employment_query(SERIES_ID, MID_YEAR, MID_YEAR + 9),
+     lambda df: pd.DataFrame({'avg_employment': [in_years(df, MID_YEAR, MID_YEAR + 9)['total_nonfarm'].mean()]})),
+    ("monthly Mar-Dec", queries.monthly_employment_query(SERIES_ID, MID_YEAR, MID_YEAR + 1, months=range(3, 13)),
+     lambda df: expected_monthly(df, MID_YEAR, MID_YEAR + 1, months=range(3, 13))),
+    ("monthly all months", queries.monthly_employment_query(SERIES_ID, MIN_YEAR, MAX_YEAR),
+     lambda df: expected_monthly(df, MIN_YEAR, MAX_YEAR)),
+    ("quarterly growth", queries.quarterly_growth_query(SERIES_ID, MIN_YEAR, MAX_YEAR, [1, 2, 3, 4]),
+     lambda df: expected_quarterly(df, MIN_YEAR, MAX_YEAR, [1, 2, 3, 4])),
+    ("quarterly growth Q1+Q3", queries.quarterly_growth_query(SERIES_ID, MID_YEAR, MAX_YEAR, [1, 3]),
+     lambda df: expected_quarterly(df, MID_YEAR, MAX_YEAR, [1, 3])),
+    ("quarterly growth, none selected", queries.quarterly_growth_query(SERIES_ID, MID_YEAR, MAX_YEAR, []),
+     lambda df: expected_quarterly(df, MID_YEAR, MAX_YEAR, [])),
+    ("annual growth", queries.annual_growth_query(SERIES_ID, MIN_YEAR, MAX_YEAR),
+     lambda df: expected_annual(df, MIN_YEAR, MAX_YEAR)),
+    ("annual growth (from mid)", queries.annual_growth_query(SERIES_ID, MID_YEAR, MAX_YEAR),
+     lambda df: expected_annual(df, MID_YEAR, MAX_YEAR)),
+]
+
+
+def normalize(df):
+    """Common dtypes for both sides: datetimes for dates, float64 for every other number."""
+    df = df.reset_index(drop=True)
+    for column in df.columns:
+        if column in ('date', 'min_date', 'max_date'):
+            df[column] = pd.to_datetime(df[column])
+        elif column not in ('series_id', 'append_only'):
+            df[column] = df[column].astype('float64')
+    return df
+
+
+@pytest.mark.parametrize('query, expected', [case[1:] for case in CASES], ids=[case[0] for case in CASES])
+def test_duckdb_matches_pandas(payrolls, query, expected):
+    result = normalize(engine.read_sql(*query, engine='duckdb'))
+    reference = normalize(expected(payrolls))
+    assert list(result.columns) == list(reference.columns)
+    assert len(result) == len(reference)
+    pd.testing.assert_frame_equal(result, reference, check_dtype=False, rtol=1e-9)
+
+
+def test_full_reload_of_one_series_keeps_the_others(tmp_path, monkeypatch):
+    """A per-series full rewrite publishes a new generation with the other series carried over."""
+    df = make_payroll_frame(1800, n_series=3)
+    seed_snapshot(df, str(tmp_path))
+    monkeypatch.setattr(engine, 'SNAPSHOT_DIR', str(tmp_path))
+    series = df[df['series_id'] == SERIES_ID]
+    reloaded = series.assign(total_nonfarm=series['total_nonfarm'] + 1.0)
+    loads = pd.read_parquet(engine._current_generation(str(tmp_path)) + "/etl_loads.parquet")
+    loads = pd.concat([loads, loads.iloc[[1]].assign(load_id=4)], ignore_index=True)
+    engine.write_snapshot(reloaded, loads, 4, 'full', series_id=SERIES_ID)
+
+    counts = engine.read_sql("SELECT series_id, COUNT(*) AS n FROM nonfarm_payrolls GROUP BY 1 ORDER BY 1",
+                             engine='duckdb')
+    assert counts['n'].tolist() == [len(series)] * 3
+    average = engine.read_sql(*queries.average_employment_query(SERIES_ID, MIN_YEAR, MAX_YEAR), engine='duckdb')
+    assert np.isclose(average['avg_employment'].iloc[0], reloaded['total_nonfarm'].mean())
+    assert engine.snapshot_load_id() == 4
+    assert len(list(tmp_path.glob('gen_*'))) == 2